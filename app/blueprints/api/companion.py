@@ -3,13 +3,20 @@
 from flask import Blueprint, jsonify, request, send_file
 from flask_login import current_user
 from app import db
-from app.models import User, Game, Achievement
+from app.models import User, UserGame, SteamApp, Achievement, AchievementDefinition
+from app.services.achievement_writer import ensure_definition
+from app.services.game_catalog import ensure_user_game
+from app.services.game_stats import GAME_TIERS, apply_game_stats_delta
+from app.services.pagination import InvalidCursor, SortKey, keyset_page
+from app.services.user_stats import apply_user_stats_delta, ensure_user_stats, tier_delta
 from datetime import datetime
 import secrets
 import os
 
 companion_api_bp = Blueprint('companion_api', __name__)
 
+EXPORT_SORT_KEYS = [SortKey(UserGame.steam_app_id)]
+
 
 @companion_api_bp.route('/register', methods=['POST'])
 def register_companion():
@@ -95,11 +102,29 @@ def get_companion_games(steam_id):
         if not user:
             return jsonify({'message': 'User not found'}), 404
         
+        query = user.games.join(UserGame.app).filter(SteamApp.total_achievements > 0)
+        try:
+            page, next_cursor = keyset_page(
+                query, 'export', EXPORT_SORT_KEYS,
+                cursor=request.args.get('cursor'),
+                limit=request.args.get('limit', type=int)
+            )
+        except InvalidCursor as e:
+            return jsonify({'message': str(e)}), 400
+        
+        achievements_by_game = {}
+        if page:
+            for achievement in Achievement.query.filter(
+                Achievement.user_id == user.id,
+                Achievement.game_id.in_([game.id for game in page])
+            ).order_by(Achievement.id):
+                achievements_by_game.setdefault(achievement.game_id, []).append(achievement)
+        
         games = []
-        for game in user.games.filter(Game.total_achievements > 0).all():
+        for game in page:
             achievements_data = []
             
-            for achievement in game.achievements.filter_by(user_id=user.id).all():
+            for achievement in achievements_by_game.get(game.id, []):
                 achievements_data.append({
                     'id': achievement.steam_achievement_id,
                     'name': achievement.name,
@@ -119,7 +144,7 @@ def get_companion_games(steam_id):
                 'achievements': achievements_data
             })
         
-        return jsonify({'games': games, 'count': len(games)})
+        return jsonify({'games': games, 'count': len(games), 'next_cursor': next_cursor})
         
     except Exception as e:
         print(f"Error getting companion games: {e}")
@@ -156,7 +181,7 @@ def get_notification_assets(asset_type, filename):
 @companion_api_bp.route('/sync-trigger', methods=['POST'])
 def trigger_companion_sync():
     try:
-        from app.tasks import full_steam_sync, quick_steam_sync
+        from app.tasks import start_user_sync
         
         data = request.get_json()
         token = data.get('token') or request.headers.get('Authorization', '').replace('Bearer ', '')
@@ -170,15 +195,21 @@ def trigger_companion_sync():
         
         sync_type = data.get('sync_type', 'quick')
         
-        if sync_type == 'full':
-            task = full_steam_sync.delay(user.id)
+        if sync_type in ('full', 'incremental'):
+            dispatch = start_user_sync(user.id, sync_type)
+        else:
+            dispatch = start_user_sync(user.id, 'quick', max_games=20)
+        
+        if dispatch['started']:
+            message = f'{sync_type.title()} sync started'
         else:
-            task = quick_steam_sync.delay(user.id, max_games=20)
+            message = f'{dispatch["sync_type"].title()} sync already running'
         
         return jsonify({
-            'message': f'{sync_type.title()} sync started',
-            'task_id': task.id,
-            'sync_type': sync_type
+            'message': message,
+            'task_id': dispatch['task_id'],
+            'sync_type': dispatch['sync_type'],
+            'deduplicated': not dispatch['started']
         })
         
     except Exception as e:
@@ -210,31 +241,41 @@ def companion_achievement_unlock():
         app_id = int(data['app_id'])
         achievement_id = data['achievement_id']
         
-        game = Game.query.filter_by(user_id=user.id, steam_app_id=app_id).first()
-        if not game:
-            game = Game(
-                user_id=user.id,
-                steam_app_id=app_id,
-                name=data.get('game_name', f"Game {app_id}"),
-                header_image=f"https://steamcdn-a.akamaihd.net/steam/apps/{app_id}/header.jpg"
-            )
-            db.session.add(game)
-            db.session.flush()
+        game = ensure_user_game(user.id, app_id, data.get('game_name'))
+        ensure_user_stats(user.id)
+        
+        # Definitions are shared by every owner of the app, so an unknown one
+        # gets placeholder text for the next schema sync to replace rather
+        # than whatever the client sent.
+        definition = ensure_definition(
+            app_id,
+            achievement_id,
+            name=achievement_id,
+            description='',
+            icon_url='',
+            global_percentage=100.0,
+            rarity_tier=AchievementDefinition.rarity_tier_for(100.0)
+        )
         
         achievement = Achievement.query.filter_by(
             user_id=user.id,
-            game_id=game.id,
-            steam_achievement_id=achievement_id
+            definition_id=definition.id
         ).first()
         
+        was_unlocked = bool(achievement and achievement.unlocked)
+        tier_before = definition.rarity_tier if was_unlocked else None
+        had_trophies = db.session.query(Achievement.id).filter_by(
+            user_id=user.id, game_id=game.id, unlocked=True
+        ).first() is not None
+        was_completed = game.completion_percentage == 100.0
+        
+        is_new = achievement is None
         if not achievement:
+            apply_user_stats_delta(user.id, total_achievements=1)
             achievement = Achievement(
                 user_id=user.id,
                 game_id=game.id,
-                steam_achievement_id=achievement_id,
-                name=data.get('achievement_name', achievement_id),
-                description=data.get('achievement_description', ''),
-                icon_url=data.get('achievement_icon', ''),
+                definition=definition,
                 unlocked=True,
                 unlock_time=datetime.utcnow()
             )
@@ -244,12 +285,23 @@ def companion_achievement_unlock():
                 achievement.unlocked = True
                 achievement.unlock_time = datetime.utcnow()
         
-        if 'global_percentage' in data:
-            achievement.global_percentage = float(data['global_percentage'])
-            achievement.calculate_rarity_tier()
-        
         game.calculate_completion()
         
+        stats_delta = tier_delta(tier_before, definition.rarity_tier)
+        stats_delta['unlocked_achievements'] = int(not was_unlocked)
+        stats_delta['games_with_trophies'] = int(not had_trophies)
+        stats_delta['platinum_count'] = int(game.completion_percentage == 100.0) - int(was_completed)
+        apply_user_stats_delta(user.id, **stats_delta)
+        
+        db.session.flush()
+        apply_game_stats_delta(
+            game,
+            unlock=None if was_unlocked else (achievement.unlock_time, achievement.id),
+            achievement_count=int(is_new),
+            unlocked_count=int(not was_unlocked),
+            **tier_delta(tier_before, definition.rarity_tier, GAME_TIERS)
+        )
+        
         db.session.commit()
         
         notification_data = {
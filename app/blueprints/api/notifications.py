@@ -1,12 +1,18 @@
 """Notification API endpoints for HTTP polling."""
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request
 from flask_login import login_required, current_user
 from app import db
 from app.models import Notification
+from app.services.pagination import InvalidCursor, SortKey, keyset_page
 from datetime import datetime
 
 notifications_api_bp = Blueprint('notifications_api', __name__, url_prefix='/api/notifications')
 
+NOTIFICATION_SORT_KEYS = [
+    SortKey(Notification.created_at, descending=True, nulls_last=True),
+    SortKey(Notification.id, descending=True)
+]
+
 
 @notifications_api_bp.route('/unread', methods=['GET'])
 @login_required
@@ -14,19 +20,30 @@ def get_unread_notifications():
     """Get all unread/undismissed notifications for the current user.
     
     Returns notifications that haven't been dismissed yet,
-    ordered by creation time (newest first).
+    ordered by creation time (newest first), one page at a time.
+    Pass the returned ``next_cursor`` back as ``cursor`` for the next page.
     
     Used by frontend polling to check for new notifications.
     """
     try:
         # Query for non-dismissed notifications for this user
-        notifications = Notification.query.filter_by(
+        query = Notification.query.filter_by(
             user_id=current_user.id
         ).filter(
             Notification.dismissed_at.is_(None)
-        ).order_by(
-            Notification.created_at.desc()
-        ).all()
+        )
+        
+        try:
+            notifications, next_cursor = keyset_page(
+                query, 'unread', NOTIFICATION_SORT_KEYS,
+                cursor=request.args.get('cursor'),
+                limit=request.args.get('limit', type=int)
+            )
+        except InvalidCursor as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
         
         # Convert to JSON
         notifications_data = []
@@ -46,7 +63,8 @@ def get_unread_notifications():
         return jsonify({
             'success': True,
             'notifications': notifications_data,
-            'count': len(notifications_data)
+            'count': len(notifications_data),
+            'next_cursor': next_cursor
         }), 200
         
     except Exception as e:
@@ -4,7 +4,7 @@ from flask import Blueprint, jsonify, redirect, url_for, flash
 from flask_login import login_required, current_user
 from celery.result import AsyncResult
 from app import celery
-from app.tasks import full_steam_sync, quick_steam_sync, sync_specific_games
+from app.tasks import start_user_sync
 from app.task_utils import TaskManager, get_task_summary
 
 sync_api_bp = Blueprint('sync_api', __name__)
@@ -18,9 +18,12 @@ def sync_steam():
         return redirect(url_for('profile.profile'))
     
     try:
-        task = full_steam_sync.delay(current_user.id)
-        flash(f'Full Steam sync started! Task ID: {task.id}')
-        return redirect(url_for('sync_api.sync_status', task_id=task.id))
+        dispatch = start_user_sync(current_user.id, 'full')
+        if dispatch['started']:
+            flash(f'Full Steam sync started! Task ID: {dispatch["task_id"]}')
+        else:
+            flash(f'A {dispatch["sync_type"]} Steam sync is already running. Task ID: {dispatch["task_id"]}')
+        return redirect(url_for('sync_api.sync_status', task_id=dispatch['task_id']))
         
     except ImportError as e:
         flash(f'Error importing sync task: {str(e)}')
@@ -38,9 +41,12 @@ def sync_steam_quick():
         return redirect(url_for('profile.profile'))
     
     try:
-        task = quick_steam_sync.delay(current_user.id, max_games=20)
-        flash(f'Quick Steam sync started! Task ID: {task.id}')
-        return redirect(url_for('sync_api.sync_status', task_id=task.id))
+        dispatch = start_user_sync(current_user.id, 'quick', max_games=20)
+        if dispatch['started']:
+            flash(f'Quick Steam sync started! Task ID: {dispatch["task_id"]}')
+        else:
+            flash(f'A {dispatch["sync_type"]} Steam sync is already running. Task ID: {dispatch["task_id"]}')
+        return redirect(url_for('sync_api.sync_status', task_id=dispatch['task_id']))
         
     except ImportError as e:
         flash(f'Error importing sync task: {str(e)}')
@@ -98,7 +104,8 @@ def task_status(task_id):
                     'sync_type': task.info.get('sync_type'),
                     'start_time': task.info.get('start_time'),
                     'duration_seconds': task.info.get('duration_seconds', 0),
-                    'avg_games_per_second': task.info.get('avg_games_per_second', 0)
+                    'avg_games_per_second': task.info.get('avg_games_per_second', 0),
+                    'pipeline': task.info.get('pipeline')
                 })
             else:
                 response.update({
@@ -192,62 +199,104 @@ def active_tasks():
 @login_required
 def search_games():
     from flask import request
-    from app.models import Game, Achievement
+    from app.services.game_listing import game_sort, games_query, sort_keys
+    from app.services.pagination import InvalidCursor, keyset_page
     
-    query = request.args.get('q', '').strip().lower()
-    sort_by = request.args.get('sort', 'recent')
+    query = request.args.get('q', '').strip()
+    sort_by = game_sort(request.args.get('sort'), query)
     min_completion = request.args.get('min_completion', type=int)
     max_completion = request.args.get('max_completion', type=int)
     has_trophies = request.args.get('has_trophies', 'true').lower() == 'true'
+    limit = request.args.get('limit', type=int)
     
-    user_games = current_user.games
-    
-    if has_trophies:
-        user_games = user_games.filter(Game.total_achievements > 0)
+    games = games_query(
+        current_user.id,
+        search=query,
+        min_completion=min_completion,
+        max_completion=max_completion,
+        with_catalog_achievements=has_trophies
+    )
+    try:
+        games, next_cursor = keyset_page(games, sort_by, sort_keys(sort_by, query), cursor=request.args.get('cursor'), limit=limit)
+    except InvalidCursor as e:
+        return jsonify({'message': str(e)}), 400
     
-    games = user_games.all()
     results = []
     
     for game in games:
-        total_achievements = game.achievements.filter_by(user_id=current_user.id).count()
-        unlocked_achievements = game.achievements.filter_by(user_id=current_user.id, unlocked=True).count()
-        completion_rate = (unlocked_achievements / total_achievements * 100) if total_achievements > 0 else 0
-        
-        if query and query not in game.name.lower():
-            continue
-            
-        if min_completion is not None and completion_rate < min_completion:
-            continue
-            
-        if max_completion is not None and completion_rate > max_completion:
-            continue
-        
-        trophy_counts = {
-            'platinum': game.achievements.filter_by(user_id=current_user.id, unlocked=True, rarity_tier='platinum').count(),
-            'gold': game.achievements.filter_by(user_id=current_user.id, unlocked=True, rarity_tier='gold').count(), 
-            'silver': game.achievements.filter_by(user_id=current_user.id, unlocked=True, rarity_tier='silver').count(),
-            'bronze': game.achievements.filter_by(user_id=current_user.id, unlocked=True, rarity_tier='bronze').count()
-        }
-        
         results.append({
             'id': game.id,
             'name': game.name,
             'steam_app_id': game.steam_app_id,
-            'completion_rate': round(completion_rate, 1),
-            'trophy_counts': trophy_counts,
-            'total_unlocked': unlocked_achievements,
-            'total_available': total_achievements,
+            'completion_rate': round(game.unlocked_rate, 1),
+            'trophy_counts': game.trophy_counts(),
+            'total_unlocked': game.unlocked_count or 0,
+            'total_available': game.achievement_count or 0,
             'playtime_forever': game.playtime_forever or 0,
             'last_played': game.last_played.isoformat() if game.last_played else None
         })
     
-    if sort_by == 'completion':
-        results.sort(key=lambda x: x['completion_rate'], reverse=True)
-    elif sort_by == 'name':
-        results.sort(key=lambda x: x['name'].lower())
-    elif sort_by == 'playtime':
-        results.sort(key=lambda x: x['playtime_forever'], reverse=True)
-    else:
-        results.sort(key=lambda x: x['last_played'] or '', reverse=True)
+    return jsonify({'games': results, 'count': len(results), 'next_cursor': next_cursor})
+
+
+@sync_api_bp.route('/achievements/search')
+@login_required
+def search_achievements():
+    from flask import request
+    from sqlalchemy.orm import contains_eager
+    from app.models import Achievement, AchievementDefinition, UserGame
+    from app.services.pagination import InvalidCursor, SortKey, keyset_page
+    from app.services.search import achievement_text_match
+    
+    query = request.args.get('q', '').strip()
+    match = achievement_text_match(query)
+    if match is None:
+        return jsonify({'message': 'A search query is required'}), 400
+    
+    achievements = Achievement.query.filter(Achievement.user_id == current_user.id)\
+        .join(Achievement.definition)\
+        .options(contains_eager(Achievement.definition))\
+        .filter(match.condition)
+    
+    unlocked = request.args.get('unlocked')
+    if unlocked is not None:
+        achievements = achievements.filter(Achievement.unlocked == (unlocked.lower() == 'true'))
+    game_id = request.args.get('game_id', type=int)
+    if game_id is not None:
+        achievements = achievements.filter(Achievement.game_id == game_id)
+    
+    try:
+        achievements, next_cursor = keyset_page(
+            achievements, 'relevance', [SortKey(match.rank), SortKey(Achievement.id)],
+            cursor=request.args.get('cursor'),
+            limit=request.args.get('limit', type=int)
+        )
+    except InvalidCursor as e:
+        return jsonify({'message': str(e)}), 400
+    
+    games = {}
+    game_ids = {achievement.game_id for achievement in achievements}
+    if game_ids:
+        games = {game.id: game for game in UserGame.query.filter(UserGame.id.in_(game_ids))}
+    
+    results = []
+    for achievement in achievements:
+        game = games.get(achievement.game_id)
+        results.append({
+            'id': achievement.id,
+            'steam_id': achievement.steam_achievement_id,
+            'name': achievement.name,
+            'description': achievement.description,
+            'icon_url': achievement.icon_url,
+            'rarity_tier': achievement.rarity_tier,
+            'global_percentage': achievement.global_percentage,
+            'unlocked': achievement.unlocked,
+            'unlock_time': achievement.unlock_time.isoformat() if achievement.unlock_time else None,
+            'game': {
+                'id': game.id,
+                'name': game.name,
+                'steam_app_id': game.steam_app_id
+            } if game else None
+        })
     
-    return jsonify({'games': results, 'count': len(results)})
\ No newline at end of file
+    return jsonify({'achievements': results, 'count': len(results), 'next_cursor': next_cursor})
\ No newline at end of file
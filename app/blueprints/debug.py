@@ -5,7 +5,7 @@ from flask_login import login_required, current_user
 from datetime import datetime
 from app import db
 from flask import current_app as app
-from app.models import User, Game, Achievement
+from app.models import User, UserGame, Achievement
 
 debug_bp = Blueprint('debug', __name__)
 
@@ -82,6 +82,17 @@ def debug_steam_raw(steam_id, app_id):
         })
 
 
+@debug_bp.route('/steam-rate-limit')
+@login_required
+def debug_steam_rate_limit():
+    try:
+        from app.steam_api import steam_api
+
+        return jsonify(steam_api.api_service.rate_limiter.get_metrics())
+    except Exception as e:
+        return jsonify({'error': str(e)})
+
+
 @debug_bp.route('/sync-single-game/<int:app_id>')
 @login_required
 def debug_sync_single_game(app_id):
@@ -89,12 +100,19 @@ def debug_sync_single_game(app_id):
         return jsonify({'error': 'No Steam ID set'})
     
     try:
-        from app.tasks import sync_specific_games
+        from app.tasks import start_user_sync
+        
+        dispatch = start_user_sync(current_user.id, 'specific', app_ids=[app_id])
         
-        task = sync_specific_games.delay(current_user.id, [app_id])
+        if not dispatch['started']:
+            return jsonify({
+                'task_id': dispatch['task_id'],
+                'status': 'already_running',
+                'message': f'A {dispatch["sync_type"]} sync is already running'
+            })
         
         return jsonify({
-            'task_id': task.id,
+            'task_id': dispatch['task_id'],
             'status': 'started',
             'message': f'Single game sync started for app {app_id}'
         })
@@ -180,14 +198,19 @@ def debug_force_sync():
         return jsonify({'error': 'No Steam ID configured'})
     
     try:
-        from app.tasks import quick_steam_sync
+        from app.tasks import start_user_sync
+        
+        dispatch = start_user_sync(current_user.id, 'quick', max_games=5)
         
-        task = quick_steam_sync.delay(current_user.id, max_games=5)
+        if dispatch['started']:
+            message = 'Debug sync started with 5 games limit'
+        else:
+            message = f'A {dispatch["sync_type"]} sync is already running'
         
         return jsonify({
-            'task_id': task.id,
-            'message': 'Debug sync started with 5 games limit',
-            'status_url': f'/api/task-status/{task.id}',
+            'task_id': dispatch['task_id'],
+            'message': message,
+            'status_url': f'/api/task-status/{dispatch["task_id"]}',
             'user_id': current_user.id,
             'steam_id': current_user.steam_id
         })
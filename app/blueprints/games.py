@@ -1,12 +1,20 @@
 """Games blueprint for game listing and trophy views."""
 
-from flask import Blueprint, render_template, request, redirect, url_for, flash
+from flask import Blueprint, render_template, request, redirect, url_for, flash, abort, jsonify
 from flask_login import login_required, current_user
-from datetime import datetime
-from app.models import Game, Achievement
+from sqlalchemy.orm import contains_eager
+from app.models import UserGame, Achievement, AchievementDefinition
+from app.services.game_listing import game_sort, games_query, sort_keys, summarize_games
+from app.services.pagination import InvalidCursor, SortKey, keyset_page
 
 games_bp = Blueprint('games', __name__)
 
+ACHIEVEMENT_SORT_KEYS = [
+    SortKey(Achievement.unlocked, descending=True),
+    SortKey(AchievementDefinition.name, nulls_last=True),
+    SortKey(Achievement.id)
+]
+
 
 @games_bp.route('/games')
 @login_required
@@ -15,26 +23,20 @@ def games():
         flash('Please add your Steam ID to view games.', 'warning')
         return redirect(url_for('profile.profile'))
     
-    user_games = current_user.games.all()
+    show_all = request.args.get('show_all', 'false').lower() == 'true'
+    sort_by = game_sort(request.args.get('sort', 'recent'))
+    cursor = request.args.get('cursor')
+    
+    query = games_query(current_user.id, with_achievements=not show_all)
+    try:
+        page, next_cursor = keyset_page(query, sort_by, sort_keys(sort_by), cursor=cursor)
+    except InvalidCursor:
+        abort(400)
+    
     games_data = []
     
-    for game in user_games:
-        all_achievements = game.achievements.filter_by(user_id=current_user.id)
-        total_achievements = all_achievements.count()
-        unlocked_achievements = all_achievements.filter_by(unlocked=True).count()
-        
-        completion_rate = (unlocked_achievements / total_achievements * 100) if total_achievements > 0 else 0
-        
-        trophy_counts = {
-            'platinum': all_achievements.filter_by(unlocked=True, rarity_tier='platinum').count(),
-            'gold': all_achievements.filter_by(unlocked=True, rarity_tier='gold').count(),
-            'silver': all_achievements.filter_by(unlocked=True, rarity_tier='silver').count(),
-            'bronze': all_achievements.filter_by(unlocked=True, rarity_tier='bronze').count()
-        }
-        
-        latest_unlock = all_achievements.filter_by(unlocked=True)\
-            .filter(Achievement.unlock_time.isnot(None))\
-            .order_by(Achievement.unlock_time.desc()).first()
+    for game in page:
+        total_achievements = game.achievement_count or 0
         
         playtime_hours = 0
         if hasattr(game, 'playtime_forever') and game.playtime_forever:
@@ -42,74 +44,70 @@ def games():
         
         games_data.append({
             'game': game,
-            'completion_rate': round(completion_rate, 1),
-            'trophy_counts': trophy_counts,
-            'total_unlocked': unlocked_achievements,
+            'completion_rate': round(game.unlocked_rate, 1),
+            'trophy_counts': game.trophy_counts(),
+            'total_unlocked': game.unlocked_count or 0,
             'total_available': total_achievements,
-            'latest_unlock': latest_unlock,
+            'latest_unlock_time': game.latest_unlock_time,
+            'latest_unlock_id': game.latest_unlock_id,
             'playtime_hours': playtime_hours,
             'has_achievements': total_achievements > 0
         })
     
-    show_all = request.args.get('show_all', 'false').lower() == 'true'
-    if not show_all:
-        games_data = [g for g in games_data if g['has_achievements']]
-    
-    sort_by = request.args.get('sort', 'recent')
+    next_url = None
+    if next_cursor:
+        next_url = url_for('games.games', sort=sort_by, show_all=str(show_all).lower(), cursor=next_cursor, partial=1)
     
-    if sort_by == 'completion':
-        games_data.sort(key=lambda x: x['completion_rate'], reverse=True)
-    elif sort_by == 'name':
-        games_data.sort(key=lambda x: x['game'].name.lower())
-    elif sort_by == 'playtime':
-        games_data.sort(key=lambda x: x['game'].playtime_forever or 0, reverse=True)
-    else:
-        games_data.sort(key=lambda x: x['game'].last_played or datetime.min, reverse=True)
-    
-    total_games = len(games_data)
-    completed_games = len([g for g in games_data if g['completion_rate'] == 100])
-    total_trophies = sum(sum(g['trophy_counts'].values()) for g in games_data)
-    avg_completion = sum(g['completion_rate'] for g in games_data) / total_games if total_games > 0 else 0
+    if request.args.get('partial'):
+        return jsonify({
+            'html': render_template('partials/game_cards.html', games_data=games_data),
+            'next_url': next_url
+        })
     
-    summary_stats = {
-        'total_games': total_games,
-        'completed_games': completed_games,
-        'total_trophies': total_trophies,
-        'avg_completion': round(avg_completion, 1)
-    }
+    summary_stats = summarize_games(query)
     
     return render_template('games.html', 
                          title='My Games',
                          games_data=games_data,
                          summary_stats=summary_stats,
                          sort_by=sort_by,
-                         show_all=show_all)
+                         show_all=show_all,
+                         next_url=next_url)
 
 
 @games_bp.route('/games/<int:game_id>/trophies')
 @login_required
 def game_trophies(game_id):
-    game = Game.query.filter_by(id=game_id, user_id=current_user.id).first_or_404()
+    game = UserGame.query.filter_by(id=game_id, user_id=current_user.id).first_or_404()
     
-    achievements = game.achievements.filter_by(user_id=current_user.id)\
-        .order_by(Achievement.unlocked.desc(), Achievement.name).all()
+    query = game.achievements.filter_by(user_id=current_user.id)\
+        .join(Achievement.definition)\
+        .options(contains_eager(Achievement.definition))
+    try:
+        achievements, next_cursor = keyset_page(
+            query, 'trophies', ACHIEVEMENT_SORT_KEYS,
+            cursor=request.args.get('cursor'),
+            limit=request.args.get('limit', type=int)
+        )
+    except InvalidCursor:
+        abort(400)
     
-    total_count = len(achievements)
-    unlocked_count = sum(1 for a in achievements if a.unlocked)
-    completion_rate = (unlocked_count / total_count * 100) if total_count > 0 else 0
+    next_url = None
+    if next_cursor:
+        next_url = url_for('games.game_trophies', game_id=game.id, cursor=next_cursor, partial=1)
     
-    trophy_counts = {
-        'platinum': sum(1 for a in achievements if a.unlocked and a.rarity_tier == 'platinum'),
-        'gold': sum(1 for a in achievements if a.unlocked and a.rarity_tier == 'gold'),
-        'silver': sum(1 for a in achievements if a.unlocked and a.rarity_tier == 'silver'),
-        'bronze': sum(1 for a in achievements if a.unlocked and a.rarity_tier == 'bronze')
-    }
+    if request.args.get('partial'):
+        return jsonify({
+            'html': render_template('partials/trophy_entries.html', achievements=achievements),
+            'next_url': next_url
+        })
     
     return render_template('game_trophies.html',
                          title=f'{game.name} - Trophies',
                          game=game,
                          achievements=achievements,
-                         total_count=total_count,
-                         unlocked_count=unlocked_count,
-                         completion_rate=completion_rate,
-                         trophy_counts=trophy_counts)
\ No newline at end of file
+                         total_count=game.achievement_count or 0,
+                         unlocked_count=game.unlocked_count or 0,
+                         completion_rate=game.unlocked_rate,
+                         trophy_counts=game.trophy_counts(),
+                         next_url=next_url)
@@ -2,7 +2,8 @@
 
 from flask import Blueprint, render_template, jsonify
 from flask_login import login_required, current_user
-from app.models import Achievement, Game
+from app.models import Achievement, UserGame
+from app.services.user_stats import get_user_stats
 from sqlalchemy import func
 from app import db
 
@@ -14,15 +15,12 @@ main_bp = Blueprint('main', __name__)
 @login_required
 def index():
     try:
-        trophy_counts = current_user.get_trophy_counts()
+        stats = get_user_stats(current_user)
+        trophy_counts = stats.trophy_counts()
         
         total_trophies = sum(trophy_counts.values())
-        total_games = Game.query.filter_by(user_id=current_user.id).count()
-        
-        games_with_trophies = db.session.query(Achievement.game_id).filter(
-            Achievement.user_id == current_user.id,
-            Achievement.unlocked == True
-        ).distinct().count()
+        total_games = stats.total_games
+        games_with_trophies = stats.games_with_trophies
         
         avg_completion = 0
         if total_games > 0:
@@ -44,7 +42,7 @@ def index():
                 
                 avg_completion = sum(completion_rates) / len(completion_rates) if completion_rates else 0
         
-        trophy_level = current_user.get_trophy_level()
+        trophy_level = stats.level
         
         recent_achievements = Achievement.query.filter_by(
             user_id=current_user.id,
@@ -81,20 +79,14 @@ def index():
 @login_required
 def get_stats():
     try:
-        trophy_counts = current_user.get_trophy_counts()
-        
-        total_trophies = sum(trophy_counts.values())
-        total_games = Game.query.filter_by(user_id=current_user.id).count()
-        games_with_trophies = db.session.query(Achievement.game_id).filter(
-            Achievement.user_id == current_user.id,
-            Achievement.unlocked == True
-        ).distinct().count()
+        stats = get_user_stats(current_user)
+        trophy_counts = stats.trophy_counts()
         
         return jsonify({
             'trophy_counts': trophy_counts,
-            'total_trophies': total_trophies,
-            'total_games': total_games,
-            'games_with_trophies': games_with_trophies
+            'total_trophies': sum(trophy_counts.values()),
+            'total_games': stats.total_games,
+            'games_with_trophies': stats.games_with_trophies
         })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -112,15 +104,12 @@ def demo():
                             message='Demo account not found')
         
     try:
-        trophy_counts = demo_user.get_trophy_counts()
+        stats = get_user_stats(demo_user)
+        trophy_counts = stats.trophy_counts()
             
         total_trophies = sum(trophy_counts.values())
-        total_games = Game.query.filter_by(user_id=demo_user.id).count()
-            
-        games_with_trophies = db.session.query(Achievement.game_id).filter(
-            Achievement.user_id == demo_user.id,
-            Achievement.unlocked == True
-        ).distinct().count()
+        total_games = stats.total_games
+        games_with_trophies = stats.games_with_trophies
             
         avg_completion = 0
         if total_games > 0:
@@ -142,14 +131,14 @@ def demo():
                     
                 avg_completion = sum(completion_rates) / len(completion_rates) if completion_rates else 0
             
-        trophy_level = demo_user.get_trophy_level()
+        trophy_level = stats.level
             
         recent_achievements = Achievement.query.filter_by(
             user_id=demo_user.id,
             unlocked=True
         ).order_by(Achievement.unlock_time.desc()).limit(10).all()
             
-        sample_games = Game.query.filter_by(user_id=demo_user.id).limit(6).all()
+        sample_games = UserGame.query.filter_by(user_id=demo_user.id).limit(6).all()
             
         return render_template(
             'demo.html',
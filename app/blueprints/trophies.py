@@ -3,6 +3,7 @@
 from flask import Blueprint, render_template
 from flask_login import login_required, current_user
 from app.models import Achievement
+from app.services.user_stats import get_user_stats
 
 trophies_bp = Blueprint('trophies', __name__)
 
@@ -10,7 +11,7 @@ trophies_bp = Blueprint('trophies', __name__)
 @trophies_bp.route('/trophies')
 @login_required
 def trophies():
-    trophy_counts = current_user.get_trophy_counts()
+    stats = get_user_stats(current_user)
     
     recent_achievements = current_user.achievements.filter_by(unlocked=True)\
         .filter(Achievement.unlock_time.isnot(None))\
@@ -19,6 +20,6 @@ def trophies():
     
     return render_template('trophies.html', 
                      title='My Trophies', 
-                     trophy_counts=trophy_counts,
-                     trophy_level=current_user.get_trophy_level(),
+                     trophy_counts=stats.trophy_counts(),
+                     trophy_level=stats.level,
                      recent_achievements=recent_achievements)
\ No newline at end of file
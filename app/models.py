@@ -1,6 +1,7 @@
 from datetime import datetime
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
+from sqlalchemy.ext.hybrid import hybrid_property
 from werkzeug.security import generate_password_hash, check_password_hash
 from app import db
 
@@ -26,8 +27,9 @@ class User(UserMixin, db.Model):
     last_sync = db.Column(db.DateTime)
    
     achievements = db.relationship('Achievement', backref='owner', lazy='dynamic')
-    games = db.relationship('Game', backref='owner', lazy='dynamic')
+    games = db.relationship('UserGame', backref='owner', lazy='dynamic')
     notifications = db.relationship('Notification', backref='user', lazy='dynamic')
+    stats = db.relationship('UserStats', backref='user', uselist=False)
    
     def set_password(self, password):
         self.password_hash = generate_password_hash(password)
@@ -36,57 +38,160 @@ class User(UserMixin, db.Model):
         return check_password_hash(self.password_hash, password)
    
     def get_trophy_counts(self):
-        """Get trophy counts by tier."""
-        achievements = self.achievements.filter_by(unlocked=True).all()
-        counts = {'platinum': 0, 'gold': 0, 'silver': 0, 'bronze': 0}
-        
-        for achievement in achievements:
-            if achievement.rarity_tier in ['gold', 'silver', 'bronze']:
-                counts[achievement.rarity_tier] += 1
-        
-        completed_games = self.games.filter_by(completion_percentage=100.0).count()
-        counts['platinum'] = completed_games
-        
-        return counts
+        """Get trophy counts by tier from the user's stats record."""
+        from app.services.user_stats import get_user_stats
+        return get_user_stats(self).trophy_counts()
     
     def get_trophy_level(self):
-        counts = self.get_trophy_counts()
-        
-        points = (
-            counts['platinum'] * 300 +
-            counts['gold'] * 90 +
-            counts['silver'] * 30 +
-            counts['bronze'] * 15
-        )
-        
-        level = points // 100
-        
-        return level
+        from app.services.user_stats import get_user_stats
+        return get_user_stats(self).level
    
     def __repr__(self):
         return f'<User {self.username}>'
 
 
-class Game(db.Model):
-    id = db.Column(db.Integer, primary_key=True)
-    steam_app_id = db.Column(db.Integer, unique=True, index=True)
+class UserStats(db.Model):
+    """Denormalized trophy totals for one user.
+
+    Syncs and companion unlocks adjust the counters in the same transaction
+    as the rows they write; ``reconcile_user_stats`` recounts them from the
+    achievement tables to repair drift. Platinum counts completed games.
+    """
+    
+    __tablename__ = 'user_stats'
+    
+    TIER_POINTS = {'platinum': 300, 'gold': 90, 'silver': 30, 'bronze': 15}
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True, autoincrement=False)
+    
+    platinum_count = db.Column(db.Integer, default=0, nullable=False)
+    gold_count = db.Column(db.Integer, default=0, nullable=False)
+    silver_count = db.Column(db.Integer, default=0, nullable=False)
+    bronze_count = db.Column(db.Integer, default=0, nullable=False)
+    points = db.Column(db.Integer, default=0, nullable=False)
+    
+    total_games = db.Column(db.Integer, default=0, nullable=False)
+    games_with_trophies = db.Column(db.Integer, default=0, nullable=False)
+    total_achievements = db.Column(db.Integer, default=0, nullable=False)
+    unlocked_achievements = db.Column(db.Integer, default=0, nullable=False)
+    
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    reconciled_at = db.Column(db.DateTime)
+    
+    @property
+    def level(self):
+        return (self.points or 0) // 100
+    
+    @property
+    def total_trophies(self):
+        return sum(self.trophy_counts().values())
+    
+    def trophy_counts(self):
+        return {
+            'platinum': self.platinum_count or 0,
+            'gold': self.gold_count or 0,
+            'silver': self.silver_count or 0,
+            'bronze': self.bronze_count or 0
+        }
+    
+    def __repr__(self):
+        return f'<UserStats {self.user_id} level {self.level}>'
+
+
+class SteamApp(db.Model):
+    """Global Steam app catalog shared by every owner of the game."""
+    
+    __tablename__ = 'steam_app'
+    
+    steam_app_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
     name = db.Column(db.String(255), index=True)
     header_image = db.Column(db.String(255))
+    total_achievements = db.Column(db.Integer, default=0)
+    
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<SteamApp {self.steam_app_id} {self.name}>'
+
+
+db.Index('ix_steam_app_lower_name', db.func.lower(SteamApp.name), SteamApp.steam_app_id)
+
+
+class UserGame(db.Model):
+    """A user's ownership of a Steam app, with their playtime and progress."""
+    
+    __tablename__ = 'user_game'
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'steam_app_id', name='uq_user_game_user_app'),
+    )
    
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'))
+    id = db.Column(db.Integer, primary_key=True)
+    steam_app_id = db.Column(db.Integer, db.ForeignKey('steam_app.steam_app_id'), nullable=False, index=True)
+   
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), index=True)
     playtime_forever = db.Column(db.Integer, default=0)
     playtime_2weeks = db.Column(db.Integer, default=0)
    
-    total_achievements = db.Column(db.Integer, default=0)
     unlocked_achievements = db.Column(db.Integer, default=0)
     completion_percentage = db.Column(db.Float, default=0.0)
    
+    # Totals over every achievement row of the game, platinum included,
+    # kept current by the writers in app.services.game_stats.
+    achievement_count = db.Column(db.Integer, default=0)
+    unlocked_count = db.Column(db.Integer, default=0)
+    platinum_count = db.Column(db.Integer, default=0)
+    gold_count = db.Column(db.Integer, default=0)
+    silver_count = db.Column(db.Integer, default=0)
+    bronze_count = db.Column(db.Integer, default=0)
+    latest_unlock_time = db.Column(db.DateTime)
+    latest_unlock_id = db.Column(db.Integer)
+   
     last_played = db.Column(db.DateTime)
+    rtime_last_played = db.Column(db.Integer)
     added_at = db.Column(db.DateTime, default=datetime.utcnow)
     last_synced = db.Column(db.DateTime)
    
+    app = db.relationship('SteamApp', lazy='joined', innerjoin=True)
     achievements = db.relationship('Achievement', backref='game', lazy='dynamic')
    
+    @property
+    def name(self):
+        return self.app.name
+   
+    @property
+    def header_image(self):
+        return self.app.header_image
+   
+    @property
+    def total_achievements(self):
+        return self.app.total_achievements or 0
+   
+    @hybrid_property
+    def unlocked_rate(self):
+        """Share of this game's achievement rows that are unlocked, in percent."""
+        if self.achievement_count:
+            return (self.unlocked_count or 0) / self.achievement_count * 100
+        return 0
+   
+    @unlocked_rate.expression
+    def unlocked_rate(cls):
+        # Literals instead of bound parameters so queries match ix_user_game_user_unlocked_rate,
+        # and a float cast so keyset cursors round-trip the value exactly.
+        return db.cast(db.case(
+            (cls.achievement_count > db.literal_column('0'),
+             db.func.coalesce(cls.unlocked_count, db.literal_column('0')) * db.literal_column('100.0') / cls.achievement_count),
+            else_=db.literal_column('0.0')
+        ), db.Float)
+   
+    def trophy_counts(self):
+        return {
+            'platinum': self.platinum_count or 0,
+            'gold': self.gold_count or 0,
+            'silver': self.silver_count or 0,
+            'bronze': self.bronze_count or 0
+        }
+   
     def calculate_completion(self):
         """Calculate achievement completion percentage."""
         if self.total_achievements > 0:
@@ -112,40 +217,108 @@ class Game(db.Model):
         self.last_synced = datetime.utcnow()
    
     def __repr__(self):
-        return f'<Game {self.name}>'
+        return f'<UserGame {self.name}>'
 
 
-class Achievement(db.Model):
+# Keyset pagination orders of the games listing (app.services.game_listing.sort_keys).
+db.Index('ix_user_game_user_last_played', UserGame.user_id, UserGame.last_played.desc(), UserGame.id)
+db.Index('ix_user_game_user_playtime', UserGame.user_id, UserGame.playtime_forever.desc(), UserGame.id)
+db.Index('ix_user_game_user_unlocked_rate', UserGame.user_id, UserGame.unlocked_rate.desc(), UserGame.id)
+
+
+class AchievementDefinition(db.Model):
+    """App-level achievement metadata shared by every user who owns the game."""
+    
+    __tablename__ = 'achievement_definition'
+    __table_args__ = (
+        db.UniqueConstraint('app_id', 'api_name', name='uq_achievement_definition_app_api_name'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
-    steam_achievement_id = db.Column(db.String(128), index=True)
+    app_id = db.Column(db.Integer, nullable=False, index=True)
+    api_name = db.Column(db.String(128), nullable=False)
+    
     name = db.Column(db.String(255))
     description = db.Column(db.Text)
     icon_url = db.Column(db.String(255))
     icon_gray_url = db.Column(db.String(255))
+    
+    global_percentage = db.Column(db.Float, default=0.0)
+    rarity_tier = db.Column(db.String(20))
+    schema_version = db.Column(db.String(40))
+    
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    @staticmethod
+    def rarity_tier_for(global_percentage):
+        """Get the rarity tier for an unlock percentage."""
+        if global_percentage < 10.0:
+            return 'gold'
+        elif global_percentage < 25.0:
+            return 'silver'
+        else:
+            return 'bronze'
+    
+    def calculate_rarity_tier(self):
+        """Set rarity tier based on unlock percentage."""
+        self.rarity_tier = self.rarity_tier_for(self.global_percentage)
+    
+    def __repr__(self):
+        return f'<AchievementDefinition {self.app_id}:{self.api_name}>'
+
+
+class Achievement(db.Model):
+    """A user's unlock state for one achievement definition."""
+    
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'definition_id', name='uq_achievement_user_definition'),
+    )
+   
+    id = db.Column(db.Integer, primary_key=True)
    
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'))
-    game_id = db.Column(db.Integer, db.ForeignKey('game.id'))
+    game_id = db.Column(db.Integer, db.ForeignKey('user_game.id'))
+    definition_id = db.Column(db.Integer, db.ForeignKey('achievement_definition.id'), nullable=False)
    
     unlocked = db.Column(db.Boolean, default=False)
     unlock_time = db.Column(db.DateTime)
    
-    global_percentage = db.Column(db.Float, default=0.0)
-    rarity_tier = db.Column(db.String(20))
-   
     notification_sent = db.Column(db.Boolean, default=False)
     notification_sent_at = db.Column(db.DateTime)
    
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
    
-    def calculate_rarity_tier(self):
-        """Set rarity tier based on unlock percentage."""
-        if self.global_percentage < 10.0:
-            self.rarity_tier = 'gold'
-        elif self.global_percentage < 25.0:
-            self.rarity_tier = 'silver'
-        else:
-            self.rarity_tier = 'bronze'
+    definition = db.relationship('AchievementDefinition', lazy='joined', innerjoin=True)
+   
+    @property
+    def steam_achievement_id(self):
+        return self.definition.api_name
+   
+    @property
+    def name(self):
+        return self.definition.name
+   
+    @property
+    def description(self):
+        return self.definition.description
+   
+    @property
+    def icon_url(self):
+        return self.definition.icon_url
+   
+    @property
+    def icon_gray_url(self):
+        return self.definition.icon_gray_url
+   
+    @property
+    def global_percentage(self):
+        return self.definition.global_percentage
+   
+    @property
+    def rarity_tier(self):
+        return self.definition.rarity_tier
    
     def get_rarity_description(self):
         """Get rarity description."""
@@ -167,6 +340,9 @@ class Achievement(db.Model):
         return f'<Achievement {self.name}>'
 
 
+db.Index('ix_achievement_game_unlocked', Achievement.game_id, Achievement.unlocked.desc(), Achievement.id)
+
+
 class Notification(db.Model):
     """Store user notifications."""
     
@@ -223,6 +399,9 @@ class Notification(db.Model):
         return f'<Notification {self.type}: {self.title}>'
 
 
+db.Index('ix_notifications_user_created', Notification.user_id, Notification.created_at.desc(), Notification.id.desc())
+
+
 class TaskProgress:
     """Track task progress for background jobs."""
     
@@ -0,0 +1,136 @@
+"""Set-based writes of synced achievement rows."""
+
+import hashlib
+import json
+import logging
+from typing import Dict, List, Sequence
+
+from sqlalchemy import select, tuple_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app import db
+from app.models import Achievement, AchievementDefinition
+
+logger = logging.getLogger(__name__)
+
+DEFINITION_CONFLICT_COLUMNS = ('app_id', 'api_name')
+
+DEFINITION_UPDATE_COLUMNS = (
+    'name',
+    'description',
+    'icon_url',
+    'icon_gray_url',
+    'global_percentage',
+    'rarity_tier',
+    'schema_version',
+    'updated_at'
+)
+
+ACHIEVEMENT_CONFLICT_COLUMNS = ('user_id', 'definition_id')
+
+ACHIEVEMENT_UPDATE_COLUMNS = (
+    'game_id',
+    'unlocked',
+    'unlock_time',
+    'updated_at'
+)
+
+BATCH_SIZE = 500
+
+
+def schema_version(schema: List[Dict]) -> str:
+    """Fingerprint a Steam schema so definitions record which version wrote them."""
+    return hashlib.sha1(json.dumps(schema, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def ensure_definition(app_id: int, api_name: str, **defaults) -> AchievementDefinition:
+    """Get an app's definition by API name, creating it from ``defaults`` if missing."""
+    definition = AchievementDefinition.query.filter_by(app_id=app_id, api_name=api_name).first()
+    if definition:
+        return definition
+
+    definition = AchievementDefinition(app_id=app_id, api_name=api_name, **defaults)
+    try:
+        with db.session.begin_nested():
+            db.session.add(definition)
+    except IntegrityError:
+        definition = AchievementDefinition.query.filter_by(app_id=app_id, api_name=api_name).one()
+    return definition
+
+
+def upsert_achievement_definitions(rows: List[Dict]) -> int:
+    """Insert or update app-level definitions keyed by (app_id, api_name).
+
+    Rows may span several apps. ``created_at`` is never overwritten. The
+    caller commits.
+    """
+    return _upsert(AchievementDefinition, rows, DEFINITION_CONFLICT_COLUMNS, DEFINITION_UPDATE_COLUMNS)
+
+
+def upsert_achievements(rows: List[Dict]) -> int:
+    """Insert or update per-user unlock rows keyed by (user_id, definition_id).
+
+    Rows may span several games. Notification fields and ``created_at`` are
+    never overwritten. The caller commits.
+    """
+    return _upsert(Achievement, rows, ACHIEVEMENT_CONFLICT_COLUMNS, ACHIEVEMENT_UPDATE_COLUMNS)
+
+
+def _upsert(model, rows: List[Dict], conflict_columns: Sequence[str], update_columns: Sequence[str]) -> int:
+    """Write rows carrying the conflict columns and every update column.
+
+    PostgreSQL and SQLite write each batch with a single
+    ``INSERT ... ON CONFLICT DO UPDATE``; other databases fall back to a bulk
+    update plus a bulk insert.
+    """
+    if not rows:
+        return 0
+
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        insert = postgresql.insert
+    elif dialect == 'sqlite':
+        insert = sqlite.insert
+    else:
+        insert = None
+
+    for start in range(0, len(rows), BATCH_SIZE):
+        batch = rows[start:start + BATCH_SIZE]
+        if insert is None:
+            _upsert_generic(model, batch, conflict_columns, update_columns)
+            continue
+
+        stmt = insert(model.__table__).values(batch)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(conflict_columns),
+            set_={column: stmt.excluded[column] for column in update_columns}
+        )
+        db.session.execute(stmt)
+
+    return len(rows)
+
+
+def _upsert_generic(model, rows: List[Dict], conflict_columns: Sequence[str], update_columns: Sequence[str]):
+    keys = [tuple(row[column] for column in conflict_columns) for row in rows]
+    key_columns = [getattr(model, column) for column in conflict_columns]
+    existing_ids = {
+        tuple(found[1:]): found[0]
+        for found in db.session.execute(
+            select(model.id, *key_columns).where(tuple_(*key_columns).in_(keys))
+        )
+    }
+
+    updates = []
+    inserts = []
+    for key, row in zip(keys, rows):
+        row_id = existing_ids.get(key)
+        if row_id is None:
+            inserts.append(row)
+        else:
+            updates.append({'id': row_id, **{column: row[column] for column in update_columns}})
+
+    if updates:
+        db.session.execute(update(model), updates)
+    if inserts:
+        db.session.execute(model.__table__.insert(), inserts)
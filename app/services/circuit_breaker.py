@@ -0,0 +1,173 @@
+"""Circuit breaking and adaptive backoff for Steam Web API endpoint families."""
+
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import redis
+
+from app.services.redis_store import get_steam_redis, report_redis_failure
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'steam_circuit:'
+
+
+class SteamAPIUnavailable(Exception):
+    """Steam is throttling or failing for an endpoint family; retry after ``retry_after`` seconds.
+
+    Deliberately not a ``requests.RequestException`` so callers that treat
+    request errors as "no data" let it propagate instead.
+    """
+
+    def __init__(self, family: str, retry_after: float, reason: str = 'circuit open'):
+        self.family = family
+        self.retry_after = max(1, int(retry_after + 0.999))
+        self.reason = reason
+        super().__init__(f"Steam {family} unavailable ({reason}), retry in {self.retry_after}s")
+
+    def __reduce__(self):
+        return (self.__class__, (self.family, self.retry_after, self.reason))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given either as seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class CircuitBreaker:
+    """Circuit breaker for one endpoint family, shared by all workers through Redis.
+
+    A 429/503 opens the circuit at once for the longer of Retry-After and the
+    current backoff; other server or connection failures open it after
+    ``failure_threshold`` failures within ``failure_window`` seconds. Each
+    opening doubles the backoff up to ``max_cooldown``, and while the backoff
+    level is raised a single failure re-opens the circuit (half-open). The
+    level resets after a quiet period or a successful call.
+    """
+
+    def __init__(self, family: str, failure_threshold: int = 5, failure_window: int = 60,
+                 base_cooldown: float = 30, max_cooldown: float = 900):
+        self.family = family
+        self.failure_threshold = failure_threshold
+        self.failure_window = failure_window
+        self.base_cooldown = base_cooldown
+        self.max_cooldown = max_cooldown
+
+        self.open_key = f"{KEY_PREFIX}{family}:open"
+        self.failures_key = f"{KEY_PREFIX}{family}:failures"
+        self.level_key = f"{KEY_PREFIX}{family}:level"
+
+        self._lock = threading.Lock()
+        self._open_until = 0.0
+        self._local_failures = []
+        self._local_level = 0
+        self._local_level_until = 0.0
+        self._degraded = False
+
+    def _cooldown(self, level: int) -> float:
+        return min(self.max_cooldown, self.base_cooldown * (2 ** max(0, level - 1)))
+
+    def before_request(self):
+        """Raise SteamAPIUnavailable if the circuit is open."""
+        remaining = self._open_until - time.monotonic()
+        if remaining > 0:
+            raise SteamAPIUnavailable(self.family, remaining)
+
+        client = get_steam_redis()
+        if client is None:
+            return
+        try:
+            ttl_ms = client.pttl(self.open_key)
+        except redis.RedisError as e:
+            report_redis_failure(e)
+            return
+        if ttl_ms and ttl_ms > 0:
+            self._open_until = time.monotonic() + ttl_ms / 1000
+            raise SteamAPIUnavailable(self.family, ttl_ms / 1000)
+
+    def record_success(self):
+        if not self._degraded:
+            return
+        self._degraded = False
+        with self._lock:
+            self._local_failures = []
+            self._local_level = 0
+
+        client = get_steam_redis()
+        if client is None:
+            return
+        try:
+            client.delete(self.failures_key, self.level_key)
+        except redis.RedisError as e:
+            report_redis_failure(e)
+
+    def record_failure(self, retry_after: Optional[float] = None, throttled: bool = False) -> float:
+        """Count a failure; return the cooldown if it opened the circuit, else 0."""
+        self._degraded = True
+        client = get_steam_redis()
+        if client is not None:
+            try:
+                return self._record_failure_shared(client, retry_after, throttled)
+            except redis.RedisError as e:
+                report_redis_failure(e)
+        return self._record_failure_local(retry_after, throttled)
+
+    def _record_failure_shared(self, client, retry_after, throttled) -> float:
+        pipe = client.pipeline()
+        pipe.incr(self.failures_key)
+        pipe.expire(self.failures_key, self.failure_window)
+        pipe.get(self.level_key)
+        failures, _, level = pipe.execute()
+        level = int(level or 0)
+
+        if not (throttled or level > 0 or failures >= self.failure_threshold):
+            return 0.0
+
+        level = client.incr(self.level_key)
+        client.expire(self.level_key, int(self.max_cooldown * 2))
+        cooldown = max(retry_after or 0.0, self._cooldown(level))
+        client.set(self.open_key, level, px=int(cooldown * 1000))
+        client.delete(self.failures_key)
+        self._open(cooldown, level, throttled)
+        return cooldown
+
+    def _record_failure_local(self, retry_after, throttled) -> float:
+        with self._lock:
+            now = time.monotonic()
+            if now > self._local_level_until:
+                self._local_level = 0
+            self._local_failures = [t for t in self._local_failures if now - t < self.failure_window]
+            self._local_failures.append(now)
+
+            if not (throttled or self._local_level > 0 or
+                    len(self._local_failures) >= self.failure_threshold):
+                return 0.0
+
+            self._local_level += 1
+            self._local_level_until = now + self.max_cooldown * 2
+            self._local_failures = []
+            level = self._local_level
+        cooldown = max(retry_after or 0.0, self._cooldown(level))
+        self._open(cooldown, level, throttled)
+        return cooldown
+
+    def _open(self, cooldown: float, level: int, throttled: bool):
+        self._open_until = time.monotonic() + cooldown
+        reason = 'throttled' if throttled else 'repeated failures'
+        logger.warning(f"Steam {self.family} circuit opened for {cooldown:.0f}s ({reason}, backoff level {level})")
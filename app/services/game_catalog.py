@@ -0,0 +1,58 @@
+"""Global Steam app catalog and per-user game ownership."""
+
+import logging
+from typing import Optional
+
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.models import SteamApp, UserGame
+from app.services.user_stats import apply_user_stats_delta, ensure_user_stats
+
+logger = logging.getLogger(__name__)
+
+
+def header_image_url(app_id: int) -> str:
+    return f"https://steamcdn-a.akamaihd.net/steam/apps/{app_id}/header.jpg"
+
+
+def ensure_steam_app(app_id: int, name: Optional[str] = None, refresh_name: bool = False) -> SteamApp:
+    """Get an app from the catalog, creating it if missing.
+
+    ``name`` is used for a new app; it replaces an existing app's name only
+    with ``refresh_name``, which only callers holding Steam data should pass.
+    """
+    steam_app = db.session.get(SteamApp, app_id)
+    if steam_app is None:
+        steam_app = SteamApp(
+            steam_app_id=app_id,
+            name=name or f'Game {app_id}',
+            header_image=header_image_url(app_id)
+        )
+        try:
+            with db.session.begin_nested():
+                db.session.add(steam_app)
+        except IntegrityError:
+            steam_app = db.session.get(SteamApp, app_id)
+    elif refresh_name and name and steam_app.name != name:
+        steam_app.name = name
+    return steam_app
+
+
+def ensure_user_game(user_id: int, app_id: int, name: Optional[str] = None,
+                     refresh_name: bool = False) -> UserGame:
+    """Get a user's ownership row for an app, adding the app and the row if missing."""
+    steam_app = ensure_steam_app(app_id, name, refresh_name)
+
+    game = UserGame.query.filter_by(user_id=user_id, steam_app_id=app_id).first()
+    if game is None:
+        # A stats record created from a full count must not see the new row yet.
+        ensure_user_stats(user_id)
+        game = UserGame(user_id=user_id, app=steam_app)
+        try:
+            with db.session.begin_nested():
+                db.session.add(game)
+        except IntegrityError:
+            return UserGame.query.filter_by(user_id=user_id, steam_app_id=app_id).one()
+        apply_user_stats_delta(user_id, total_games=1)
+    return game
@@ -0,0 +1,121 @@
+"""SQL query builder shared by the games page and the games search API."""
+
+from typing import Dict, List, Optional
+
+from sqlalchemy import case, func
+from sqlalchemy.orm import contains_eager
+
+from app import db
+from app.models import SteamApp, UserGame
+from app.services.pagination import SortKey
+from app.services.search import game_name_match
+
+GAME_SORTS = ('recent', 'completion', 'name', 'playtime', 'relevance')
+
+
+def completion_rate_column():
+    """Percent of a game's achievement rows that are unlocked, as a SQL expression."""
+    return UserGame.unlocked_rate
+
+
+def trophy_total_column():
+    return (
+        func.coalesce(UserGame.platinum_count, 0) + func.coalesce(UserGame.gold_count, 0) +
+        func.coalesce(UserGame.silver_count, 0) + func.coalesce(UserGame.bronze_count, 0)
+    )
+
+
+def game_sort(sort_by: str, search: Optional[str] = None) -> str:
+    """Normalize a sort name; relevance needs a search and is the default when there is one."""
+    if sort_by == 'relevance' and not (search or '').strip():
+        return 'recent'
+    if sort_by in GAME_SORTS:
+        return sort_by
+    return 'relevance' if (search or '').strip() else 'recent'
+
+
+def sort_keys(sort_by: str, search: Optional[str] = None) -> List[SortKey]:
+    """Keyset for a sort name, each backed by a composite index; unknown names sort by recent activity.
+
+    Name ordering breaks ties on the app id so it can walk
+    ix_steam_app_lower_name and probe uq_user_game_user_app. Relevance
+    orders by the search rank of ``search``.
+    """
+    sort_by = game_sort(sort_by, search)
+    if sort_by == 'relevance':
+        return [SortKey(game_name_match(search).rank), SortKey(UserGame.id)]
+    if sort_by == 'completion':
+        return [SortKey(completion_rate_column(), descending=True), SortKey(UserGame.id)]
+    if sort_by == 'name':
+        return [SortKey(func.lower(SteamApp.name), nulls_last=True), SortKey(UserGame.steam_app_id)]
+    if sort_by == 'playtime':
+        return [SortKey(UserGame.playtime_forever, descending=True, nulls_last=True), SortKey(UserGame.id)]
+    return [SortKey(UserGame.last_played, descending=True, nulls_last=True), SortKey(UserGame.id)]
+
+
+def games_query(
+    user_id: int,
+    search: Optional[str] = None,
+    min_completion: Optional[float] = None,
+    max_completion: Optional[float] = None,
+    with_achievements: bool = False,
+    with_catalog_achievements: bool = False
+):
+    """Build one unordered query for a user's games with the filtering done in SQL.
+
+    ``with_achievements`` keeps games that have achievement rows for the
+    user; ``with_catalog_achievements`` keeps games whose Steam app lists
+    any achievements at all. Completion bounds are inclusive percentages.
+    Pass the query to ``keyset_page`` with ``sort_keys(sort_by)`` to order
+    and page it.
+    """
+    query = UserGame.query.join(UserGame.app).options(contains_eager(UserGame.app)).filter(
+        UserGame.user_id == user_id
+    )
+
+    if with_achievements:
+        query = query.filter(UserGame.achievement_count > 0)
+    if with_catalog_achievements:
+        query = query.filter(SteamApp.total_achievements > 0)
+    match = game_name_match(search)
+    if match is not None:
+        query = query.filter(match.condition)
+
+    completion_rate = completion_rate_column()
+    if min_completion is not None:
+        query = query.filter(completion_rate >= min_completion)
+    if max_completion is not None:
+        query = query.filter(completion_rate <= max_completion)
+
+    return query
+
+
+def summarize_games(query) -> Dict:
+    """Aggregate totals over every game a ``games_query`` matches, in one query."""
+    matched = query.with_entities(
+        UserGame.id.label('id'),
+        completion_rate_column().label('completion_rate'),
+        trophy_total_column().label('trophies'),
+        func.coalesce(UserGame.unlocked_count, 0).label('unlocked')
+    ).subquery()
+
+    totals = db.session.query(
+        func.count(matched.c.id),
+        func.sum(case((matched.c.completion_rate >= 100.0, 1), else_=0)),
+        func.sum(matched.c.trophies),
+        func.avg(matched.c.completion_rate),
+        func.sum(case((matched.c.unlocked > 0, 1), else_=0)),
+        func.sum(matched.c.unlocked),
+        func.avg(case((matched.c.completion_rate > 0, matched.c.completion_rate), else_=None))
+    ).one()
+    total_games, completed_games, total_trophies, avg_completion, with_unlocks, total_unlocked, avg_started = totals
+
+    return {
+        'total_games': total_games,
+        'completed_games': int(completed_games or 0),
+        'total_trophies': int(total_trophies or 0),
+        'avg_completion': round(float(avg_completion or 0), 1),
+        'games_with_trophies': int(with_unlocks or 0),
+        'total_unlocked': int(total_unlocked or 0),
+        'avg_started_completion': round(float(avg_started or 0), 1)
+    }
@@ -0,0 +1,105 @@
+"""Maintenance of the denormalized per-game trophy totals on user_game."""
+
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import case, or_, update
+
+from app import db
+from app.models import Achievement, AchievementDefinition, UserGame
+
+logger = logging.getLogger(__name__)
+
+GAME_TIERS = ('platinum', 'gold', 'silver', 'bronze')
+
+GAME_COUNTER_COLUMNS = (
+    'achievement_count',
+    'unlocked_count',
+    'platinum_count',
+    'gold_count',
+    'silver_count',
+    'bronze_count'
+)
+
+LATEST_UNLOCK_COLUMNS = ('latest_unlock_time', 'latest_unlock_id')
+
+
+def summarize_game_achievements(
+    rows: Iterable[Tuple[Optional[int], Optional[str], bool, Optional[datetime]]]
+) -> Dict:
+    """Build every aggregate column from ``(achievement_id, tier, unlocked, unlock_time)`` rows."""
+    summary = {column: 0 for column in GAME_COUNTER_COLUMNS}
+    summary.update({column: None for column in LATEST_UNLOCK_COLUMNS})
+
+    for achievement_id, tier, unlocked, unlock_time in rows:
+        summary['achievement_count'] += 1
+        if not unlocked:
+            continue
+        summary['unlocked_count'] += 1
+        if tier in GAME_TIERS:
+            summary[f'{tier}_count'] += 1
+        if unlock_time is not None and (
+            summary['latest_unlock_time'] is None or unlock_time > summary['latest_unlock_time']
+        ):
+            summary['latest_unlock_time'] = unlock_time
+            summary['latest_unlock_id'] = achievement_id
+    return summary
+
+
+def count_game_stats(user_id: int) -> Dict[int, Dict]:
+    """Count the aggregate columns of every game the user has achievement rows for."""
+    rows_by_game = {}
+    for game_id, achievement_id, tier, unlocked, unlock_time in db.session.query(
+        Achievement.game_id, Achievement.id, AchievementDefinition.rarity_tier,
+        Achievement.unlocked, Achievement.unlock_time
+    ).join(Achievement.definition).filter(Achievement.user_id == user_id):
+        rows_by_game.setdefault(game_id, []).append((achievement_id, tier, unlocked, unlock_time))
+
+    return {game_id: summarize_game_achievements(rows) for game_id, rows in rows_by_game.items()}
+
+
+def apply_game_stats_delta(game: UserGame, unlock: Optional[Tuple[datetime, int]] = None, **deltas: int):
+    """Add ``deltas`` to a game's counters with one atomic UPDATE in the caller's transaction.
+
+    ``unlock`` is the ``(unlock_time, achievement_id)`` of a new unlock; it
+    replaces the stored latest unlock only if it is more recent.
+    """
+    deltas = {column: delta for column, delta in deltas.items() if delta}
+    unknown = set(deltas) - set(GAME_COUNTER_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown game stats columns: {', '.join(sorted(unknown))}")
+
+    table = UserGame.__table__
+    values = {column: db.func.coalesce(table.c[column], 0) + delta for column, delta in deltas.items()}
+    if unlock is not None:
+        unlock_time, achievement_id = unlock
+        is_later = or_(table.c.latest_unlock_time.is_(None), table.c.latest_unlock_time < unlock_time)
+        values['latest_unlock_time'] = case((is_later, unlock_time), else_=table.c.latest_unlock_time)
+        values['latest_unlock_id'] = case((is_later, achievement_id), else_=table.c.latest_unlock_id)
+    if not values:
+        return
+
+    db.session.execute(
+        update(UserGame).where(UserGame.id == game.id).values(values),
+        execution_options={'synchronize_session': False}
+    )
+    db.session.expire(game, list(values))
+
+
+def reconcile_game_stats(user_id: int) -> int:
+    """Recount the aggregate columns of a user's games; returns how many had drifted. The caller commits."""
+    counts = count_game_stats(user_id)
+    empty = summarize_game_achievements(())
+
+    drifted = 0
+    for game in UserGame.query.filter_by(user_id=user_id):
+        expected = counts.get(game.id, empty)
+        if any(getattr(game, column) != value for column, value in expected.items()):
+            for column, value in expected.items():
+                setattr(game, column, value)
+            drifted += 1
+
+    if drifted:
+        logger.info(f"Repaired game stats for {drifted} games of user {user_id}")
+    return drifted
@@ -0,0 +1,124 @@
+"""Keyset (cursor) pagination over ORM queries."""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, List, NamedTuple, Optional, Sequence, Tuple
+
+from flask import current_app as app
+from sqlalchemy import and_, false, or_, true
+
+
+class InvalidCursor(ValueError):
+    """Raised for a cursor that is malformed or belongs to another sort order."""
+
+
+class SortKey(NamedTuple):
+    """One ORDER BY term of a keyset; the last key of a sort must be unique."""
+
+    column: Any
+    descending: bool = False
+    nulls_last: bool = False
+
+
+def order_by_clauses(keys: Sequence[SortKey]) -> List:
+    clauses = []
+    for key in keys:
+        clause = key.column.desc() if key.descending else key.column.asc()
+        clauses.append(clause.nulls_last() if key.nulls_last else clause)
+    return clauses
+
+
+def _equals(key: SortKey, value):
+    return key.column.is_(None) if value is None else key.column == value
+
+
+def _after(key: SortKey, value):
+    if value is None:
+        # Only nulls_last keys may hold NULL, and nothing sorts after the NULLs.
+        return false()
+    if isinstance(value, bool):
+        # Booleans only support equality; the one value after True (descending) or False is the other.
+        if value == key.descending:
+            condition = key.column == (false() if value else true())
+        else:
+            condition = false()
+    else:
+        condition = key.column < value if key.descending else key.column > value
+    if key.nulls_last:
+        condition = or_(condition, key.column.is_(None))
+    return condition
+
+
+def after_cursor(keys: Sequence[SortKey], values: Sequence) -> Any:
+    """Filter for rows that sort strictly after the row with ``values``."""
+    terms = []
+    for index, key in enumerate(keys):
+        terms.append(and_(*(_equals(keys[j], values[j]) for j in range(index)), _after(key, values[index])))
+    return or_(*terms)
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    if isinstance(value, Decimal):
+        return {'dec': str(value)}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        if 'dec' in value:
+            return Decimal(value['dec'])
+        return datetime.fromisoformat(value['dt'])
+    return value
+
+
+def encode_cursor(sort_name: str, values: Sequence) -> str:
+    payload = json.dumps([sort_name, [_encode_value(value) for value in values]], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token: str, sort_name: str, key_count: int) -> List:
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        cursor_sort, values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = [_decode_value(value) for value in values]
+    except (ArithmeticError, ValueError, TypeError, KeyError, binascii.Error) as e:
+        raise InvalidCursor(f"Malformed cursor: {e}")
+
+    if cursor_sort != sort_name or len(values) != key_count:
+        raise InvalidCursor(f"Cursor does not belong to the '{sort_name}' ordering")
+    return values
+
+
+def page_size(requested: Optional[int] = None) -> int:
+    """Clamp a requested page size to ``PAGE_SIZE_MAX``, defaulting to ``PAGE_SIZE``."""
+    default = app.config.get('PAGE_SIZE', 50)
+    if requested is None or requested <= 0:
+        return default
+    return min(requested, app.config.get('PAGE_SIZE_MAX', 200))
+
+
+def keyset_page(query, sort_name: str, keys: Sequence[SortKey], cursor: Optional[str] = None,
+                limit: Optional[int] = None) -> Tuple[List, Optional[str]]:
+    """Fetch one page of ``query`` ordered by ``keys``.
+
+    Returns the page's rows and the cursor for the next page, or None on
+    the last page. ``query`` must not be ordered already.
+    """
+    limit = page_size(limit)
+    if cursor:
+        query = query.filter(after_cursor(keys, decode_cursor(cursor, sort_name, len(keys))))
+
+    rows = query.add_columns(*(key.column for key in keys))\
+        .order_by(*order_by_clauses(keys))\
+        .limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(sort_name, list(rows[-1])[1:])
+    return [row[0] for row in rows], next_cursor
@@ -0,0 +1,156 @@
+"""Distributed token-bucket rate limiting for Steam Web API calls."""
+
+import logging
+import threading
+import time
+from typing import Dict
+
+import redis
+
+from app.services.redis_store import get_steam_redis, report_redis_failure
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'steam_ratelimit:'
+
+# Reserve tokens from the bucket and return how long the caller must wait
+# before using them. The bucket may go into debt, which queues callers in
+# arrival order without extra round trips. Redis TIME is the clock, so hosts
+# with skewed clocks still share one consistent bucket.
+ACQUIRE_SCRIPT = """
+local key = KEYS[1]
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+
+local state = redis.call('HMGET', key, 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+tokens = tokens - requested
+
+redis.call('HSET', key, 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', key, math.ceil((burst - tokens) / rate * 1000) + 1000)
+
+if tokens >= 0 then
+    return '0'
+end
+return tostring(-tokens / rate)
+"""
+
+
+class LocalTokenBucket:
+    """In-process bucket used while Redis is unreachable."""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.ts = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, requested: float = 1) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.ts) * self.rate)
+            self.ts = now
+            self.tokens -= requested
+            return max(0.0, -self.tokens / self.rate)
+
+
+class TokenBucketRateLimiter:
+    """Token bucket shared by every worker process through Redis.
+
+    ``rate`` is the sustained requests per second and ``burst`` the number of
+    requests that may go out back to back after an idle period. Time spent
+    waiting is recorded both per process and in a shared Redis hash.
+    """
+
+    def __init__(self, name: str, rate: float, burst: float):
+        self.name = name
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.key = f"{KEY_PREFIX}{name}"
+        self.metrics_key = f"{KEY_PREFIX}{name}:metrics"
+        self.local_bucket = LocalTokenBucket(self.rate, self.burst)
+        self._script = None
+        self._metrics_lock = threading.Lock()
+        self._metrics = {
+            'acquired': 0,
+            'throttled': 0,
+            'wait_seconds': 0.0,
+            'max_wait_seconds': 0.0,
+            'local_fallbacks': 0
+        }
+
+    def _reserve(self, requested: float) -> float:
+        client = get_steam_redis()
+        if client is not None:
+            try:
+                if self._script is None:
+                    self._script = client.register_script(ACQUIRE_SCRIPT)
+                return float(self._script(keys=[self.key], args=[self.rate, self.burst, requested]))
+            except redis.RedisError as e:
+                report_redis_failure(e)
+
+        with self._metrics_lock:
+            self._metrics['local_fallbacks'] += 1
+        return self.local_bucket.reserve(requested)
+
+    def acquire(self, requested: float = 1) -> float:
+        """Block until ``requested`` tokens are available; return seconds waited."""
+        if self.rate <= 0:
+            return 0.0
+
+        wait = self._reserve(requested)
+        if wait > 0:
+            time.sleep(wait)
+        self._record(wait)
+        return wait
+
+    def _record(self, wait: float):
+        with self._metrics_lock:
+            self._metrics['acquired'] += 1
+            if wait > 0:
+                self._metrics['throttled'] += 1
+                self._metrics['wait_seconds'] += wait
+                self._metrics['max_wait_seconds'] = max(self._metrics['max_wait_seconds'], wait)
+
+        if wait <= 0:
+            return
+        client = get_steam_redis()
+        if client is None:
+            return
+        try:
+            pipe = client.pipeline(transaction=False)
+            pipe.hincrby(self.metrics_key, 'throttled', 1)
+            pipe.hincrbyfloat(self.metrics_key, 'wait_seconds', wait)
+            pipe.execute()
+        except redis.RedisError as e:
+            report_redis_failure(e)
+
+    def get_metrics(self) -> Dict:
+        """Waiting metrics for this process and, when reachable, all workers."""
+        with self._metrics_lock:
+            metrics = {
+                'name': self.name,
+                'rate_per_second': self.rate,
+                'burst': self.burst,
+                'process': dict(self._metrics)
+            }
+
+        client = get_steam_redis()
+        if client is not None:
+            try:
+                shared = client.hgetall(self.metrics_key)
+                metrics['cluster'] = {
+                    'throttled': int(shared.get('throttled', 0)),
+                    'wait_seconds': float(shared.get('wait_seconds', 0.0))
+                }
+            except redis.RedisError as e:
+                report_redis_failure(e)
+        return metrics
@@ -0,0 +1,55 @@
+"""Shared Redis connection for Steam caches and cross-worker coordination."""
+
+import logging
+import threading
+import time
+from typing import Optional
+
+import redis
+from flask import current_app as app
+
+logger = logging.getLogger(__name__)
+
+UNAVAILABLE_COOLDOWN_SECONDS = 30
+
+_client = None
+_client_lock = threading.Lock()
+_unavailable_until = 0.0
+
+
+def init_steam_redis(url: Optional[str] = None):
+    """Create the shared client; call once from an app context."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = redis.from_url(
+                url or app.config.get('STEAM_CACHE_REDIS_URL', 'redis://localhost:6380/3'),
+                decode_responses=True,
+                socket_connect_timeout=2,
+                socket_timeout=2,
+                health_check_interval=30
+            )
+    return _client
+
+
+def get_steam_redis():
+    """Return the shared client, or None while Redis is known to be down.
+
+    Callers fall back to in-process state when this returns None and report
+    errors through :func:`report_redis_failure` so the next few seconds of
+    calls skip Redis instead of each waiting on a connect timeout.
+    """
+    if time.monotonic() < _unavailable_until:
+        return None
+    if _client is None:
+        try:
+            return init_steam_redis()
+        except RuntimeError:
+            return None
+    return _client
+
+
+def report_redis_failure(error: Exception):
+    global _unavailable_until
+    _unavailable_until = time.monotonic() + UNAVAILABLE_COOLDOWN_SECONDS
+    logger.warning(f"Steam Redis unavailable, using in-process fallback: {error}")
@@ -0,0 +1,173 @@
+"""Indexed substring search over game and achievement names.
+
+Postgres uses pg_trgm GIN indexes on the lowercased columns, which serve
+``LIKE '%...%'`` and rank by ``similarity()``. SQLite uses FTS5 tables
+with the trigram tokenizer, kept in step with their source tables by
+triggers and ranked by ``bm25()``. Anything else, a database without
+those indexes, or a query shorter than one trigram falls back to a plain
+``LIKE`` that ranks prefix matches first.
+
+Rebuilding ``steam_app`` or ``achievement_definition`` with a SQLite
+batch migration drops the FTS triggers; recreate them with
+``install_sqlite_fts`` afterwards.
+"""
+
+import logging
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+from sqlalchemy import Float, case, cast, column, event, exc, func, literal_column, or_, select, table, text
+
+from app import db
+from app.models import AchievementDefinition, SteamApp
+
+logger = logging.getLogger(__name__)
+
+MIN_TRIGRAM_LENGTH = 3
+
+
+class SearchIndex(NamedTuple):
+    name: str
+    key: Any
+    columns: Tuple
+    weights: Tuple[float, ...]
+
+
+GAME_NAME_INDEX = SearchIndex('steam_app_fts', SteamApp.steam_app_id, (SteamApp.name,), (1.0,))
+ACHIEVEMENT_TEXT_INDEX = SearchIndex(
+    'achievement_definition_fts',
+    AchievementDefinition.id,
+    (AchievementDefinition.name, AchievementDefinition.description),
+    (10.0, 1.0)
+)
+
+
+class TextMatch(NamedTuple):
+    """A search filter and its rank expression; lower ranks are better matches."""
+
+    condition: Any
+    rank: Any
+
+
+def sqlite_fts_ddl(index: SearchIndex):
+    """Statements creating an index's FTS5 table, its sync triggers and its initial contents."""
+    table = index.key.table.name
+    key = index.key.name
+    columns = [column.name for column in index.columns]
+    column_list = ', '.join(columns)
+    new_values = ', '.join(f'new.{column}' for column in columns)
+    old_values = ', '.join(f'old.{column}' for column in columns)
+    fts = index.name
+
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({column_list}, "
+        f"content='{table}', content_rowid='{key}', tokenize='trigram')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {column_list}) VALUES (new.{key}, {new_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.{key}, {old_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {column_list} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.{key}, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {column_list}) VALUES (new.{key}, {new_values}); END",
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"
+    ]
+
+
+def install_sqlite_fts(connection, index: SearchIndex) -> bool:
+    """Create an index's FTS5 table and triggers; returns False if this SQLite lacks FTS5 trigrams."""
+    try:
+        with connection.begin_nested():
+            for statement in sqlite_fts_ddl(index):
+                connection.exec_driver_sql(statement)
+    except exc.OperationalError as e:
+        logger.warning(f"SQLite FTS5 trigram search unavailable, {index.name} falls back to LIKE: {e}")
+        return False
+    return True
+
+
+def _install_on_create(index: SearchIndex):
+    def after_create(target, connection, **kw):
+        if connection.dialect.name == 'sqlite':
+            install_sqlite_fts(connection, index)
+            _backends.clear()
+    event.listen(index.key.table, 'after_create', after_create)
+
+
+_install_on_create(GAME_NAME_INDEX)
+_install_on_create(ACHIEVEMENT_TEXT_INDEX)
+
+_backends: Dict[Tuple[str, str], str] = {}
+
+
+def search_backend(index: SearchIndex) -> str:
+    """Return 'fts5', 'trigram' or 'like' for an index on the current database."""
+    engine = db.engine
+    cache_key = (str(engine.url), index.name)
+    backend = _backends.get(cache_key)
+    if backend is not None:
+        return backend
+
+    backend = 'like'
+    try:
+        if engine.dialect.name == 'sqlite':
+            found = db.session.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {'name': index.name}
+            ).first()
+            if found:
+                backend = 'fts5'
+        elif engine.dialect.name == 'postgresql':
+            found = db.session.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")).first()
+            if found:
+                backend = 'trigram'
+    except exc.SQLAlchemyError as e:
+        logger.warning(f"Could not detect the search backend for {index.name}: {e}")
+        db.session.rollback()
+
+    _backends[cache_key] = backend
+    return backend
+
+
+def _fts_phrase(query: str) -> str:
+    return '"' + query.replace('"', '""') + '"'
+
+
+def text_match(index: SearchIndex, query: str) -> Optional[TextMatch]:
+    """Build the filter and rank for ``query`` on an index, or None for a blank query."""
+    query = (query or '').strip().lower()
+    if not query:
+        return None
+
+    backend = search_backend(index)
+    if len(query) < MIN_TRIGRAM_LENGTH:
+        backend = 'like'
+
+    lowered = [func.lower(column) for column in index.columns]
+
+    if backend == 'fts5':
+        fts = table(index.name, column('rowid'))
+        fts_match = literal_column(index.name).match(_fts_phrase(query))
+        matched = select(fts.c.rowid).where(fts_match)
+        score = select(func.bm25(literal_column(index.name), *(literal_column(repr(weight)) for weight in index.weights)))\
+            .select_from(fts)\
+            .where(fts_match, fts.c.rowid == index.key)\
+            .scalar_subquery()
+        return TextMatch(index.key.in_(matched), cast(score, Float))
+
+    condition = or_(*(column.contains(query, autoescape=True) for column in lowered))
+
+    if backend == 'trigram':
+        similarity = func.greatest(*(
+            func.similarity(func.coalesce(column, ''), query) * weight / max(index.weights)
+            for column, weight in zip(lowered, index.weights)
+        )) if len(lowered) > 1 else func.similarity(lowered[0], query)
+        return TextMatch(condition, cast(-similarity, Float))
+
+    prefix = or_(*(column.startswith(query, autoescape=True) for column in lowered))
+    return TextMatch(condition, cast(case((prefix, 0.0), else_=1.0), Float))
+
+
+def game_name_match(query: str) -> Optional[TextMatch]:
+    return text_match(GAME_NAME_INDEX, query)
+
+
+def achievement_text_match(query: str) -> Optional[TextMatch]:
+    return text_match(ACHIEVEMENT_TEXT_INDEX, query)
@@ -0,0 +1,122 @@
+"""Single-flight coalescing of identical in-flight Steam requests."""
+
+import json
+import logging
+import threading
+import time
+import uuid
+from typing import Any, Callable
+
+import redis
+
+from app.services.redis_store import get_steam_redis, report_redis_failure
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'steam_flight:'
+
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Let concurrent callers asking for the same key share one upstream call.
+
+    Within a process, the first caller for a key becomes the leader and the
+    rest wait for its result (or exception). Across processes, leaders race
+    for a short Redis lock; the winner calls upstream and publishes the result
+    under a result key, while the others poll that key until it appears, the
+    lock is released, or ``wait_timeout`` passes, in which case they call
+    upstream themselves. Results must be JSON-serializable.
+    """
+
+    def __init__(self, namespace: str, lock_ttl: float = 30.0, wait_timeout: float = 20.0,
+                 result_ttl: int = 30, poll_interval: float = 0.05):
+        self.namespace = namespace
+        self.lock_ttl = lock_ttl
+        self.wait_timeout = wait_timeout
+        self.result_ttl = result_ttl
+        self.poll_interval = poll_interval
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._release_script = None
+
+    def do(self, key: Any, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._do_shared(key, fn)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+    def _do_shared(self, key: Any, fn: Callable[[], Any]) -> Any:
+        client = get_steam_redis()
+        if client is None:
+            return fn()
+
+        lock_key = f"{KEY_PREFIX}{self.namespace}:{key}:lock"
+        result_key = f"{KEY_PREFIX}{self.namespace}:{key}:result"
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + self.wait_timeout
+
+        while True:
+            try:
+                raw = client.get(result_key)
+                if raw is not None:
+                    return json.loads(raw)
+                if client.set(lock_key, token, nx=True, px=int(self.lock_ttl * 1000)):
+                    break
+            except redis.RedisError as e:
+                report_redis_failure(e)
+                return fn()
+
+            if time.monotonic() >= deadline:
+                logger.warning(f"Gave up waiting on in-flight {self.namespace} request for {key}")
+                return fn()
+            time.sleep(self.poll_interval)
+
+        try:
+            value = fn()
+            try:
+                client.set(result_key, json.dumps(value), ex=self.result_ttl)
+            except redis.RedisError as e:
+                report_redis_failure(e)
+            return value
+        finally:
+            self._release(client, lock_key, token)
+
+    def _release(self, client, lock_key: str, token: str):
+        try:
+            if self._release_script is None:
+                self._release_script = client.register_script(RELEASE_SCRIPT)
+            self._release_script(keys=[lock_key], args=[token])
+        except redis.RedisError as e:
+            report_redis_failure(e)
@@ -1,12 +1,40 @@
 """Steam API client for Steam Web API endpoints."""
 
 import requests
-from typing import List, Dict, Optional
+from http.cookiejar import DefaultCookiePolicy
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import List, Dict, Optional, Tuple
 from flask import current_app as app
 
+from app.services.circuit_breaker import CircuitBreaker, SteamAPIUnavailable, parse_retry_after
+from app.services.rate_limiter import TokenBucketRateLimiter
+from app.services.redis_store import init_steam_redis
+from app.services.steam_cache import NegativeCache, SteamPayloadCache
+
+
+DEFAULT_TIMEOUTS = {
+    'default': (3.05, 10),
+}
+
+ENDPOINT_FAMILIES = {
+    'owned_games': 'player_service',
+    'player_achievements': 'user_stats',
+    'global_percentages': 'user_stats',
+    'schema': 'user_stats'
+}
+
+THROTTLE_STATUSES = (429, 503)
+
 
 class SteamAPIService:
-    """Steam Web API client."""
+    """Steam Web API client.
+
+    Owns a pooled keep-alive session so repeated calls to the same host reuse
+    connections instead of paying a TCP+TLS handshake per request. The session
+    holds no per-user state (cookies are refused), so one instance can be
+    shared by every thread or greenlet in a worker.
+    """
     
     def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
         self.api_key = api_key or app.config.get('STEAM_API_KEY')
@@ -14,6 +42,122 @@ class SteamAPIService:
         
         if not self.api_key:
             raise ValueError("Steam API key not configured")
+        
+        self.timeouts = dict(DEFAULT_TIMEOUTS)
+        self.timeouts.update(app.config.get('STEAM_HTTP_TIMEOUTS', {}))
+        self.session = self._build_session(
+            pool_size=app.config.get('STEAM_HTTP_POOL_SIZE', 10),
+            pool_block=app.config.get('STEAM_HTTP_POOL_BLOCK', True),
+            max_retries=app.config.get('STEAM_HTTP_MAX_RETRIES', 2),
+            backoff_factor=app.config.get('STEAM_HTTP_BACKOFF_FACTOR', 0.5)
+        )
+        
+        init_steam_redis()
+        self.breakers = {
+            family: CircuitBreaker(
+                family,
+                failure_threshold=app.config.get('STEAM_CIRCUIT_FAILURE_THRESHOLD', 5),
+                failure_window=app.config.get('STEAM_CIRCUIT_FAILURE_WINDOW', 60),
+                base_cooldown=app.config.get('STEAM_CIRCUIT_BASE_COOLDOWN', 30),
+                max_cooldown=app.config.get('STEAM_CIRCUIT_MAX_COOLDOWN', 900)
+            )
+            for family in set(ENDPOINT_FAMILIES.values()) | {'default'}
+        }
+        self.rate_limiter = TokenBucketRateLimiter(
+            'steam_web_api',
+            rate=app.config.get('STEAM_RATE_LIMIT_PER_SECOND', 10),
+            burst=app.config.get('STEAM_RATE_LIMIT_BURST', 20)
+        )
+        self.schema_cache = SteamPayloadCache(
+            'schema',
+            ttl=app.config.get('STEAM_SCHEMA_CACHE_TTL', 86400),
+            stale_ttl=app.config.get('STEAM_SCHEMA_CACHE_STALE_TTL', 604800),
+            max_entries=app.config.get('STEAM_SCHEMA_CACHE_LRU_SIZE', 512)
+        )
+        self.percentages_cache = SteamPayloadCache(
+            'percentages',
+            ttl=app.config.get('STEAM_PERCENTAGES_CACHE_TTL', 21600),
+            stale_ttl=app.config.get('STEAM_PERCENTAGES_CACHE_STALE_TTL', 2592000),
+            max_entries=app.config.get('STEAM_PERCENTAGES_CACHE_LRU_SIZE', 512)
+        )
+        self.no_stats_cache = NegativeCache(
+            'no_stats',
+            ttl=app.config.get('STEAM_NO_STATS_CACHE_TTL', 2592000),
+            revalidate_after=app.config.get('STEAM_NO_STATS_REVALIDATE_AFTER', 604800),
+            revalidate_probability=app.config.get('STEAM_NO_STATS_REVALIDATE_PROBABILITY', 0.05)
+        )
+    
+    @staticmethod
+    def _build_session(pool_size: int, pool_block: bool, max_retries: int,
+                       backoff_factor: float) -> requests.Session:
+        """Build a keep-alive session with a bounded pool and transport retries."""
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=max_retries,
+            status=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(500, 502, 504),
+            allowed_methods=frozenset(['GET']),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            pool_block=pool_block,
+            max_retries=retry
+        )
+        
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        session.headers.update({'Accept': 'application/json'})
+        return session
+    
+    def _timeout(self, endpoint: str) -> Tuple[float, float]:
+        return tuple(self.timeouts.get(endpoint, self.timeouts['default']))
+    
+    def _get_json(self, endpoint: str, url: str, params: Dict) -> Dict:
+        """GET a Steam endpoint through the pooled session and decode JSON.
+        
+        Throttling (429/503) and failures that trip the endpoint family's
+        circuit raise SteamAPIUnavailable rather than a request error, so
+        callers can pause instead of treating the outage as empty data. Other
+        5xx and transport failures raise the request error; callers whose empty
+        result would be written as data must let it propagate.
+        """
+        breaker = self.breakers[ENDPOINT_FAMILIES.get(endpoint, 'default')]
+        breaker.before_request()
+        self.rate_limiter.acquire()
+        
+        try:
+            response = self.session.get(url, params=params, timeout=self._timeout(endpoint))
+        except (requests.ConnectionError, requests.Timeout) as e:
+            cooldown = breaker.record_failure()
+            if cooldown:
+                raise SteamAPIUnavailable(breaker.family, cooldown, reason=type(e).__name__) from e
+            raise
+        
+        if response.status_code in THROTTLE_STATUSES:
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            cooldown = breaker.record_failure(retry_after=retry_after, throttled=True)
+            raise SteamAPIUnavailable(breaker.family, cooldown, reason=f'HTTP {response.status_code}')
+        
+        if response.status_code >= 500:
+            cooldown = breaker.record_failure()
+            if cooldown:
+                raise SteamAPIUnavailable(breaker.family, cooldown, reason=f'HTTP {response.status_code}')
+        else:
+            breaker.record_success()
+        
+        response.raise_for_status()
+        return response.json()
+    
+    def close(self):
+        """Release pooled connections."""
+        self.session.close()
     
     def get_user_games(self, steam_id: str, include_appinfo: bool = True, 
                       include_free_games: bool = True) -> List[Dict]:
@@ -28,9 +172,7 @@ class SteamAPIService:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_json('owned_games', url, params)
             
             if 'response' in data and 'games' in data['response']:
                 return data['response']['games']
@@ -41,7 +183,12 @@ class SteamAPIService:
             return []
     
     def get_user_achievements(self, steam_id: str, app_id: int) -> List[Dict]:
-        """Get user achievement progress for a game."""
+        """Get user achievement progress for a game.
+        
+        Request errors are raised rather than returned as an empty list: a
+        sync reads an empty list as "nothing unlocked" and would re-lock the
+        game. Only a successful response without achievements is empty.
+        """
         url = f"{self.base_url}/ISteamUserStats/GetPlayerAchievements/v0001/"
         params = {
             'key': self.api_key,
@@ -50,45 +197,61 @@ class SteamAPIService:
             'format': 'json'
         }
         
-        try:
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            if 'playerstats' in data and 'achievements' in data['playerstats']:
-                return data['playerstats']['achievements']
-            return []
-            
-        except requests.RequestException as e:
-            print(f"Steam API error for app {app_id}: {e}")
-            return []
+        data = self._get_json('player_achievements', url, params)
+        
+        if 'playerstats' in data and 'achievements' in data['playerstats']:
+            return data['playerstats']['achievements']
+        return []
     
-    def get_achievement_percentages(self, app_id: int) -> Dict[str, float]:
-        """Get global achievement unlock percentages."""
+    def _fetch_achievement_percentages(self, app_id: int) -> Dict[str, float]:
+        """Fetch global unlock percentages from Steam, raising on request errors."""
         url = f"{self.base_url}/ISteamUserStats/GetGlobalAchievementPercentagesForApp/v0002/"
         params = {
             'gameid': app_id,
             'format': 'json'
         }
         
-        try:
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            if 'achievementpercentages' in data and 'achievements' in data['achievementpercentages']:
-                return {
-                    ach['name']: float(ach['percent'])
-                    for ach in data['achievementpercentages']['achievements']
-                }
-            return {}
-            
-        except requests.RequestException as e:
-            print(f"Steam API error for app {app_id}: {e}")
-            return {}
+        data = self._get_json('global_percentages', url, params)
+        
+        if 'achievementpercentages' in data and 'achievements' in data['achievementpercentages']:
+            return {
+                ach['name']: float(ach['percent'])
+                for ach in data['achievementpercentages']['achievements']
+            }
+        return {}
     
-    def get_game_schema(self, app_id: int) -> List[Dict]:
-        """Get achievement schema for a game."""
+    def get_achievement_percentages(self, app_id: int) -> Dict[str, float]:
+        """Get global achievement unlock percentages straight from Steam, raising on request errors."""
+        return self._fetch_achievement_percentages(app_id)
+    
+    def get_cached_achievement_percentages(self, app_id: int) -> Dict[str, float]:
+        """Get global percentages for the sync hot path.
+        
+        Cached entries are returned regardless of age; keeping them current is
+        the job of the scheduled refresh, which favours the apps recorded as hot
+        here. Steam is only called on a cold miss, once for all concurrent callers.
+        Request errors are raised, since an empty map would reset every
+        definition's percentage and tier.
+        """
+        self.percentages_cache.record_hit(app_id)
+        
+        entry = self.percentages_cache.get_entry(app_id)
+        if entry is not None:
+            return entry[1]
+        
+        return self.percentages_cache.load(
+            app_id, lambda: self._fetch_achievement_percentages(app_id)
+        )
+    
+    def refresh_achievement_percentages(self, app_id: int) -> bool:
+        """Re-fetch and store one app's global percentages; False if Steam had none."""
+        percentages = self.percentages_cache.load(
+            app_id, lambda: self._fetch_achievement_percentages(app_id)
+        )
+        return bool(percentages)
+    
+    def _fetch_game_schema(self, app_id: int) -> List[Dict]:
+        """Fetch achievement schema from Steam, raising on request errors."""
         url = f"{self.base_url}/ISteamUserStats/GetSchemaForGame/v2/"
         params = {
             'key': self.api_key,
@@ -96,14 +259,28 @@ class SteamAPIService:
             'format': 'json'
         }
         
-        try:
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            if 'game' in data and 'availableGameStats' in data['game']:
-                return data['game']['availableGameStats'].get('achievements', [])
+        data = self._get_json('schema', url, params)
+        
+        if 'game' in data and 'availableGameStats' in data['game']:
+            return data['game']['availableGameStats'].get('achievements', [])
+        return []
+    
+    def _load_game_schema(self, app_id: int) -> List[Dict]:
+        """Fetch a schema unless the app is known to have no stats, keeping that record current."""
+        if self.no_stats_cache.contains(app_id):
             return []
+        
+        schema = self._fetch_game_schema(app_id)
+        if schema:
+            self.no_stats_cache.discard(app_id)
+        else:
+            self.no_stats_cache.add(app_id)
+        return schema
+    
+    def get_game_schema(self, app_id: int) -> List[Dict]:
+        """Get achievement schema for a game, shared across users via the schema cache."""
+        try:
+            return self.schema_cache.get_or_load(app_id, lambda: self._load_game_schema(app_id))
             
         except requests.RequestException as e:
             print(f"Steam API error for app {app_id}: {e}")
@@ -0,0 +1,297 @@
+"""Shared caches for app-level Steam payloads."""
+
+import json
+import logging
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, List, Optional, Set, Tuple
+
+import redis
+
+from app.services.redis_store import get_steam_redis, report_redis_failure
+from app.services.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'steam_cache:'
+
+
+class LRUCache:
+    """Small thread-safe in-process LRU of ``key -> (fetched_at, value)``.
+
+    Entries are dropped ``max_age`` seconds after they were stored locally so
+    that refreshes written to Redis by other workers become visible here.
+    """
+
+    def __init__(self, max_entries: int = 512, max_age: float = 300):
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[float, Any]]:
+        with self._lock:
+            stored = self._entries.get(key)
+            if stored is None:
+                return None
+            stored_at, entry = stored
+            if time.monotonic() - stored_at > self.max_age:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: Tuple[float, Any]):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), entry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class SteamPayloadCache:
+    """Cross-user cache of Steam responses keyed by app id.
+
+    Reads go to an in-process LRU first and then to Redis, so every worker
+    shares what any worker fetched. Entries younger than ``ttl`` are served
+    as-is; entries up to ``stale_ttl`` past that are served immediately while
+    one background refresh replaces them (stale-while-revalidate). Only
+    non-empty payloads are stored, so failed or empty fetches are retried.
+    Loads go through a single-flight group, so identical concurrent misses in
+    any worker share one upstream call.
+    """
+
+    def __init__(self, namespace: str, ttl: int, stale_ttl: int = 0, max_entries: int = 512):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.local = LRUCache(max_entries, max_age=min(ttl, 300))
+        self.single_flight = SingleFlight(namespace)
+        self._refreshing = set()
+        self._refreshing_lock = threading.Lock()
+
+    def _key(self, app_id: int) -> str:
+        return f"{KEY_PREFIX}{self.namespace}:{app_id}"
+
+    def _read(self, key: str) -> Optional[Tuple[float, Any]]:
+        entry = self.local.get(key)
+        if entry is not None:
+            return entry
+
+        client = get_steam_redis()
+        if client is None:
+            return None
+        try:
+            raw = client.get(key)
+        except redis.RedisError as e:
+            report_redis_failure(e)
+            return None
+        if raw is None:
+            return None
+
+        stored = json.loads(raw)
+        entry = (stored['fetched_at'], stored['value'])
+        self.local.set(key, entry)
+        return entry
+
+    def get_entry(self, app_id: int) -> Optional[Tuple[float, Any]]:
+        """Return ``(fetched_at, value)`` for an app, fresh or stale, if cached."""
+        return self._read(self._key(app_id))
+
+    def set(self, app_id: int, value: Any):
+        key = self._key(app_id)
+        entry = (time.time(), value)
+        self.local.set(key, entry)
+
+        client = get_steam_redis()
+        if client is None:
+            return
+        try:
+            client.set(
+                key,
+                json.dumps({'fetched_at': entry[0], 'value': value}),
+                ex=self.ttl + self.stale_ttl
+            )
+        except redis.RedisError as e:
+            report_redis_failure(e)
+
+    def invalidate(self, app_id: int):
+        key = self._key(app_id)
+        self.local.delete(key)
+
+        client = get_steam_redis()
+        if client is None:
+            return
+        try:
+            client.delete(key)
+        except redis.RedisError as e:
+            report_redis_failure(e)
+
+    def is_fresh(self, entry: Tuple[float, Any]) -> bool:
+        return time.time() - entry[0] < self.ttl
+
+    def record_hit(self, app_id: int):
+        """Count a read towards the app's hotness score."""
+        client = get_steam_redis()
+        if client is None:
+            return
+        try:
+            client.zincrby(f"{KEY_PREFIX}{self.namespace}:hot", 1, app_id)
+        except redis.RedisError as e:
+            report_redis_failure(e)
+
+    def hottest(self, limit: int) -> List[int]:
+        """Return the most-read app ids, hottest first."""
+        client = get_steam_redis()
+        if client is None:
+            return []
+        try:
+            return [int(app_id) for app_id in client.zrevrange(f"{KEY_PREFIX}{self.namespace}:hot", 0, limit - 1)]
+        except redis.RedisError as e:
+            report_redis_failure(e)
+            return []
+
+    def decay_hits(self, factor: float = 0.5, keep: int = 10000):
+        """Age hotness scores so recent demand outweighs old demand."""
+        client = get_steam_redis()
+        if client is None:
+            return
+        hot_key = f"{KEY_PREFIX}{self.namespace}:hot"
+        try:
+            client.zunionstore(hot_key, {hot_key: factor})
+            client.zremrangebyrank(hot_key, 0, -(keep + 1))
+        except redis.RedisError as e:
+            report_redis_failure(e)
+
+    def get_or_load(self, app_id: int, loader: Callable[[], Any]) -> Any:
+        """Serve a cached payload, loading and storing it on a miss.
+
+        ``loader`` should raise on upstream errors so failures are never cached.
+        """
+        entry = self.get_entry(app_id)
+        if entry is not None:
+            fetched_at, value = entry
+            age = time.time() - fetched_at
+            if age < self.ttl:
+                return value
+            if age < self.ttl + self.stale_ttl:
+                self._refresh_in_background(app_id, loader)
+                return value
+
+        return self.load(app_id, loader)
+
+    def load(self, app_id: int, loader: Callable[[], Any]) -> Any:
+        """Call ``loader`` once for all concurrent callers and store a non-empty result."""
+        def load_and_store():
+            value = loader()
+            if value:
+                self.set(app_id, value)
+            return value
+
+        return self.single_flight.do(app_id, load_and_store)
+
+    def _refresh_in_background(self, app_id: int, loader: Callable[[], Any]):
+        with self._refreshing_lock:
+            if app_id in self._refreshing:
+                return
+            self._refreshing.add(app_id)
+
+        def refresh():
+            try:
+                self.load(app_id, loader)
+            except Exception as e:
+                logger.warning(f"Background refresh of {self.namespace} for app {app_id} failed: {e}")
+            finally:
+                with self._refreshing_lock:
+                    self._refreshing.discard(app_id)
+
+        threading.Thread(
+            target=refresh,
+            name=f'steam-cache-refresh-{self.namespace}-{app_id}',
+            daemon=True
+        ).start()
+
+
+class NegativeCache:
+    """Cross-user record of apps known to have no payload, e.g. no achievement stats.
+
+    Entries live for ``ttl`` seconds. Once an entry is older than
+    ``revalidate_after``, each lookup reports a miss with probability
+    ``revalidate_probability`` so that an occasional caller re-checks Steam
+    and either re-marks the app or clears it.
+    """
+
+    def __init__(self, namespace: str, ttl: int, revalidate_after: int,
+                 revalidate_probability: float = 0.05, max_entries: int = 10000):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.revalidate_after = revalidate_after
+        self.revalidate_probability = revalidate_probability
+        self.local = LRUCache(max_entries, max_age=min(ttl, 300))
+
+    def _key(self, app_id: int) -> str:
+        return f"{KEY_PREFIX}{self.namespace}:{app_id}"
+
+    def _is_current(self, marked_at: float) -> bool:
+        if time.time() - marked_at < self.revalidate_after:
+            return True
+        return random.random() >= self.revalidate_probability
+
+    def add(self, app_id: int):
+        key = self._key(app_id)
+        marked_at = time.time()
+        self.local.set(key, (marked_at, True))
+
+        client = get_steam_redis()
+        if client is None:
+            return
+        try:
+            client.set(key, marked_at, ex=self.ttl)
+        except redis.RedisError as e:
+            report_redis_failure(e)
+
+    def discard(self, app_id: int):
+        key = self._key(app_id)
+        self.local.delete(key)
+
+        client = get_steam_redis()
+        if client is None:
+            return
+        try:
+            client.delete(key)
+        except redis.RedisError as e:
+            report_redis_failure(e)
+
+    def contains(self, app_id: int) -> bool:
+        return bool(self.filter_members([app_id]))
+
+    def filter_members(self, app_ids: Iterable[int]) -> Set[int]:
+        """Return the subset of ``app_ids`` that are cached and not due for revalidation."""
+        marked = {}
+        missing = []
+        for app_id in app_ids:
+            entry = self.local.get(self._key(app_id))
+            if entry is not None:
+                marked[app_id] = entry[0]
+            else:
+                missing.append(app_id)
+
+        client = get_steam_redis()
+        if missing and client is not None:
+            try:
+                values = client.mget([self._key(app_id) for app_id in missing])
+            except redis.RedisError as e:
+                report_redis_failure(e)
+                values = []
+            for app_id, value in zip(missing, values):
+                if value is not None:
+                    marked[app_id] = float(value)
+                    self.local.set(self._key(app_id), (float(value), True))
+
+        return {app_id for app_id, marked_at in marked.items() if self._is_current(marked_at)}
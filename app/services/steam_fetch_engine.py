@@ -0,0 +1,233 @@
+"""Concurrent Steam payload fetching for library syncs."""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from flask import current_app as app
+
+from app.services.circuit_breaker import SteamAPIUnavailable
+
+logger = logging.getLogger(__name__)
+
+_END_OF_GAMES = object()
+
+
+@dataclass
+class GamePayload:
+    """Steam responses needed to sync one game's achievements."""
+
+    app_id: int
+    schema: List[Dict] = field(default_factory=list)
+    user_achievements: List[Dict] = field(default_factory=list)
+    global_percentages: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def has_achievements(self) -> bool:
+        return bool(self.schema)
+
+
+@dataclass
+class PipelineStats:
+    """Throughput of the fetch (producer) and write (consumer) stages of one sync."""
+
+    queue_capacity: int = 0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    fetched: int = 0
+    written: int = 0
+    write_seconds: float = 0.0
+    wait_seconds: float = 0.0
+    started_at: float = field(default_factory=time.monotonic)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record_fetch(self, _future=None):
+        with self._lock:
+            self.fetched += 1
+
+    def record_queue_depth(self, depth: int):
+        with self._lock:
+            self.queue_depth = depth
+            self.max_queue_depth = max(self.max_queue_depth, depth)
+
+    def to_dict(self) -> Dict[str, float]:
+        elapsed = time.monotonic() - self.started_at
+        return {
+            'queue_depth': self.queue_depth,
+            'queue_capacity': self.queue_capacity,
+            'max_queue_depth': self.max_queue_depth,
+            'games_fetched': self.fetched,
+            'games_written': self.written,
+            'fetch_per_second': round(self.fetched / elapsed, 2) if elapsed > 0 else 0.0,
+            'write_per_second': round(self.written / elapsed, 2) if elapsed > 0 else 0.0,
+            'write_seconds': round(self.write_seconds, 2),
+            'fetch_wait_seconds': round(self.wait_seconds, 2)
+        }
+
+
+class SyncFetchContext:
+    """Memoizes Steam payloads between an app's prefetch and its write.
+
+    Every lookup a sync makes for an app (the zero-playtime schema check, the
+    achievement reconcile, the engine's prefetch) goes through the context, so
+    each payload is requested from the API service once per game. Once a game
+    is written, ``forget`` drops its payloads, which keeps memory bounded by the
+    fetch engine's window rather than the library size. It also counts the
+    achievement and definition rows the sync actually changed.
+    """
+
+    def __init__(self, api_service, steam_id: str):
+        self.api_service = api_service
+        self.steam_id = steam_id
+        self._schemas = {}
+        self._user_achievements = {}
+        self._percentages = {}
+        self._lock = threading.Lock()
+        self.fetches = 0
+        self.memo_hits = 0
+        self.achievements_changed = 0
+        self.definitions_changed = 0
+
+    def _memoize(self, store: Dict, app_id: int, fetch: Callable):
+        with self._lock:
+            if app_id in store:
+                self.memo_hits += 1
+                return store[app_id]
+
+        value = fetch()
+        with self._lock:
+            self.fetches += 1
+            return store.setdefault(app_id, value)
+
+    def forget(self, app_id: int):
+        """Drop an app's memoized payloads once its game has been written."""
+        with self._lock:
+            self._schemas.pop(app_id, None)
+            self._user_achievements.pop(app_id, None)
+            self._percentages.pop(app_id, None)
+
+    def get_game_schema(self, app_id: int) -> List[Dict]:
+        return self._memoize(self._schemas, app_id,
+                             lambda: self.api_service.get_game_schema(app_id))
+
+    def get_user_achievements(self, app_id: int) -> List[Dict]:
+        return self._memoize(self._user_achievements, app_id,
+                             lambda: self.api_service.get_user_achievements(self.steam_id, app_id))
+
+    def get_achievement_percentages(self, app_id: int) -> Dict[str, float]:
+        return self._memoize(self._percentages, app_id,
+                             lambda: self.api_service.get_cached_achievement_percentages(app_id))
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'steam_fetches': self.fetches,
+            'steam_memo_hits': self.memo_hits,
+            'achievements_changed': self.achievements_changed,
+            'definitions_changed': self.definitions_changed
+        }
+
+
+class SteamFetchEngine:
+    """Fetch schema, player achievements and global percentages for many games at once.
+
+    A producer thread submits fetches to a thread pool and queues them in
+    library order on a bounded queue, while the caller consumes them and does
+    the database work on its own thread. The queue holds at most
+    ``window_size`` games, so the producer blocks when writes fall behind.
+    Request pacing is left to the API service's shared rate limiter.
+    """
+
+    def __init__(self, max_workers: int = 8, window_size: int = 16):
+        self.max_workers = max(1, max_workers)
+        self.window_size = max(1, window_size)
+        self.stats = PipelineStats(queue_capacity=self.window_size)
+
+    @classmethod
+    def from_config(cls) -> 'SteamFetchEngine':
+        return cls(
+            max_workers=app.config.get('STEAM_FETCH_MAX_WORKERS', 8),
+            window_size=app.config.get('STEAM_FETCH_WINDOW_SIZE', 16)
+        )
+
+    def fetch_game(self, context: SyncFetchContext, app_id: int) -> GamePayload:
+        """Fetch every payload for one game, skipping user data when there is no schema."""
+        payload = GamePayload(app_id=app_id)
+        payload.schema = context.get_game_schema(app_id)
+        if not payload.schema:
+            return payload
+
+        payload.user_achievements = context.get_user_achievements(app_id)
+        payload.global_percentages = context.get_achievement_percentages(app_id)
+        return payload
+
+    def _fetch_safely(self, context: SyncFetchContext, app_id: int) -> Optional[GamePayload]:
+        try:
+            return self.fetch_game(context, app_id)
+        except SteamAPIUnavailable:
+            raise
+        except Exception as e:
+            logger.error(f"Error prefetching Steam data for app {app_id}: {e}")
+            return None
+
+    def iter_payloads(self, context: SyncFetchContext,
+                      games_data: List[Dict]) -> Iterator[Tuple[Dict, Optional[GamePayload]]]:
+        """Yield ``(game_data, payload)`` pairs; payload is None if the prefetch failed.
+
+        Fetched payloads are memoized in ``context``, so syncing a yielded game
+        through the same context makes no further Steam calls. SteamAPIUnavailable
+        from any fetch is re-raised to the caller. Time the caller spends between
+        items is counted as the write stage in ``self.stats``.
+        """
+        stats = self.stats = PipelineStats(queue_capacity=self.window_size)
+        pending = queue.Queue(maxsize=self.window_size)
+        stop = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='steam-fetch')
+
+        def enqueue(item) -> bool:
+            while not stop.is_set():
+                try:
+                    pending.put(item, timeout=0.1)
+                    stats.record_queue_depth(pending.qsize())
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce():
+            try:
+                for game_data in games_data:
+                    future = executor.submit(self._fetch_safely, context, game_data['appid'])
+                    future.add_done_callback(stats.record_fetch)
+                    if not enqueue((game_data, future)):
+                        future.cancel()
+                        return
+            except Exception as e:
+                logger.error(f"Steam fetch producer stopped: {e}")
+            finally:
+                enqueue(_END_OF_GAMES)
+
+        producer = threading.Thread(target=produce, name='steam-fetch-producer', daemon=True)
+        producer.start()
+        try:
+            while True:
+                waiting_since = time.monotonic()
+                item = pending.get()
+                if item is _END_OF_GAMES:
+                    break
+                game_data, future = item
+                payload = future.result()
+                stats.record_queue_depth(pending.qsize())
+                stats.wait_seconds += time.monotonic() - waiting_since
+
+                writing_since = time.monotonic()
+                yield game_data, payload
+                stats.write_seconds += time.monotonic() - writing_since
+                stats.written += 1
+        finally:
+            stop.set()
+            producer.join()
+            executor.shutdown(wait=True, cancel_futures=True)
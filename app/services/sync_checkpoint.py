@@ -0,0 +1,103 @@
+"""Durable progress checkpoints for long-running library syncs."""
+
+import json
+import logging
+from typing import Dict, List, Optional
+
+import redis
+from flask import current_app as app
+
+from app.services.redis_store import get_steam_redis, report_redis_failure
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'steam_sync_checkpoint:'
+
+COUNTER_FIELDS = ('current', 'games_synced', 'games_skipped', 'games_failed', 'no_stats_skipped')
+
+
+class SyncCheckpoint:
+    """Ordered work list and cursor of one sync task, kept in Redis.
+
+    The key is the Celery task id, which stays the same across ``self.retry``
+    and across redelivery of an unacknowledged task after a worker restart,
+    so a rerun picks up at the cursor instead of at game 0. The work list is
+    written once; only the cursor and counters change as the sync advances.
+    Without Redis the checkpoint is a no-op and the sync starts from scratch.
+    """
+
+    def __init__(self, task_id: str, ttl: Optional[int] = None):
+        self.key = f"{KEY_PREFIX}{task_id}"
+        self.ttl = ttl if ttl is not None else app.config.get('STEAM_SYNC_CHECKPOINT_TTL', 86400)
+
+    def load(self, user_id: int) -> Optional[Dict]:
+        """Return ``{'app_ids', 'cursor', 'start_time', **counters}`` or None if there is none."""
+        client = get_steam_redis()
+        if client is None:
+            return None
+        try:
+            stored = client.hgetall(self.key)
+        except redis.RedisError as e:
+            report_redis_failure(e)
+            return None
+
+        if not stored or int(stored.get('user_id', 0)) != user_id:
+            return None
+
+        try:
+            checkpoint = {
+                'app_ids': json.loads(stored['app_ids']),
+                'cursor': int(stored.get('cursor', 0)),
+                'start_time': stored.get('start_time')
+            }
+            for name in COUNTER_FIELDS:
+                checkpoint[name] = int(stored.get(name, 0))
+        except (KeyError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable sync checkpoint {self.key}: {e}")
+            return None
+        return checkpoint
+
+    def start(self, user_id: int, app_ids: List[int], start_time: str, **counters):
+        """Record the ordered work list with the cursor at its first game."""
+        client = get_steam_redis()
+        if client is None:
+            return
+        try:
+            pipe = client.pipeline()
+            pipe.delete(self.key)
+            pipe.hset(self.key, mapping={
+                'user_id': user_id,
+                'app_ids': json.dumps(app_ids),
+                'cursor': 0,
+                'start_time': start_time,
+                **{name: counters.get(name, 0) for name in COUNTER_FIELDS}
+            })
+            pipe.expire(self.key, self.ttl)
+            pipe.execute()
+        except redis.RedisError as e:
+            report_redis_failure(e)
+
+    def advance(self, cursor: int, **counters):
+        """Move the cursor past every game whose writes are committed."""
+        client = get_steam_redis()
+        if client is None:
+            return
+        try:
+            pipe = client.pipeline()
+            pipe.hset(self.key, mapping={
+                'cursor': cursor,
+                **{name: value for name, value in counters.items() if name in COUNTER_FIELDS}
+            })
+            pipe.expire(self.key, self.ttl)
+            pipe.execute()
+        except redis.RedisError as e:
+            report_redis_failure(e)
+
+    def clear(self):
+        client = get_steam_redis()
+        if client is None:
+            return
+        try:
+            client.delete(self.key)
+        except redis.RedisError as e:
+            report_redis_failure(e)
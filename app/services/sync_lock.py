@@ -0,0 +1,126 @@
+"""Per-user singleton lock for Steam library syncs."""
+
+import logging
+from typing import Optional, Tuple
+
+import redis
+from flask import current_app as app
+
+from app.services.redis_store import get_steam_redis, report_redis_failure
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'steam_sync_lock:'
+
+RELEASE_SCRIPT = """
+local held = redis.call('GET', KEYS[1])
+if held and string.sub(held, 1, string.len(ARGV[1]) + 1) == ARGV[1] .. '|' then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+EXTEND_SCRIPT = """
+local held = redis.call('GET', KEYS[1])
+if held and string.sub(held, 1, string.len(ARGV[1]) + 1) == ARGV[1] .. '|' then
+    return redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+SWAP_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+    return 1
+end
+return 0
+"""
+
+
+class UserSyncLock:
+    """Record which sync task currently owns a user's library.
+
+    The lock value is ``"<task_id>|<sync_type>"``, so callers that lose the
+    race can hand back the owner's task id instead of queueing a duplicate.
+    Only the owning task can release or extend it, and it expires after
+    ``STEAM_SYNC_LOCK_TTL`` without an extension in case the owner dies
+    without releasing. Without Redis every acquire succeeds, which matches
+    the behaviour before locking.
+    """
+
+    _release_script = None
+    _extend_script = None
+    _swap_script = None
+
+    def __init__(self, user_id: int, ttl: Optional[int] = None):
+        self.key = f"{KEY_PREFIX}{user_id}"
+        self.ttl = ttl if ttl is not None else app.config.get('STEAM_SYNC_LOCK_TTL', 7200)
+
+    @staticmethod
+    def _value(task_id: str, sync_type: str) -> str:
+        return f"{task_id}|{sync_type}"
+
+    def acquire(self, task_id: str, sync_type: str) -> bool:
+        client = get_steam_redis()
+        if client is None:
+            return True
+        try:
+            return bool(client.set(self.key, self._value(task_id, sync_type), nx=True, ex=self.ttl))
+        except redis.RedisError as e:
+            report_redis_failure(e)
+            return True
+
+    def holder(self) -> Optional[Tuple[str, str]]:
+        """Return ``(task_id, sync_type)`` of the owning task, or None."""
+        client = get_steam_redis()
+        if client is None:
+            return None
+        try:
+            held = client.get(self.key)
+        except redis.RedisError as e:
+            report_redis_failure(e)
+            return None
+        if not held or '|' not in held:
+            return None
+        task_id, sync_type = held.split('|', 1)
+        return task_id, sync_type
+
+    def extend(self, task_id: str) -> bool:
+        """Restart the TTL of a lock ``task_id`` owns; returns False if it no longer owns it."""
+        client = get_steam_redis()
+        if client is None:
+            return True
+        try:
+            if UserSyncLock._extend_script is None:
+                UserSyncLock._extend_script = client.register_script(EXTEND_SCRIPT)
+            return bool(UserSyncLock._extend_script(keys=[self.key], args=[task_id, self.ttl]))
+        except redis.RedisError as e:
+            report_redis_failure(e)
+            return True
+
+    def swap(self, held: Tuple[str, str], task_id: str, sync_type: str) -> bool:
+        """Hand the lock from ``held`` to a new task, failing if the owner changed meanwhile."""
+        client = get_steam_redis()
+        if client is None:
+            return True
+        try:
+            if UserSyncLock._swap_script is None:
+                UserSyncLock._swap_script = client.register_script(SWAP_SCRIPT)
+            return bool(UserSyncLock._swap_script(
+                keys=[self.key],
+                args=[self._value(*held), self._value(task_id, sync_type), self.ttl]
+            ))
+        except redis.RedisError as e:
+            report_redis_failure(e)
+            return True
+
+    def release(self, task_id: str):
+        client = get_steam_redis()
+        if client is None:
+            return
+        try:
+            if UserSyncLock._release_script is None:
+                UserSyncLock._release_script = client.register_script(RELEASE_SCRIPT)
+            UserSyncLock._release_script(keys=[self.key], args=[task_id])
+        except redis.RedisError as e:
+            report_redis_failure(e)
@@ -1,7 +1,7 @@
 """Detects special trophy events like Platinum trophies."""
 
 import logging
-from app.models import Game, User, Notification
+from app.models import UserGame, User, Notification
 from app import db
 from app.services.notification_factory import NotificationFactory
 
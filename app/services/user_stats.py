@@ -0,0 +1,140 @@
+"""Maintenance of the denormalized per-user trophy totals."""
+
+import logging
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import func, update
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.models import Achievement, AchievementDefinition, User, UserGame, UserStats
+
+logger = logging.getLogger(__name__)
+
+COUNTER_COLUMNS = (
+    'platinum_count',
+    'gold_count',
+    'silver_count',
+    'bronze_count',
+    'total_games',
+    'games_with_trophies',
+    'total_achievements',
+    'unlocked_achievements'
+)
+
+COUNTED_TIERS = ('gold', 'silver', 'bronze')
+
+
+def count_user_stats(user_id: int) -> Dict[str, int]:
+    """Count every stats column from the achievement and game tables."""
+    counts = {column: 0 for column in COUNTER_COLUMNS}
+
+    tier_counts = db.session.query(
+        AchievementDefinition.rarity_tier, func.count(Achievement.id)
+    ).join(Achievement.definition).filter(
+        Achievement.user_id == user_id,
+        Achievement.unlocked == True,
+        AchievementDefinition.rarity_tier.in_(COUNTED_TIERS)
+    ).group_by(AchievementDefinition.rarity_tier)
+    for tier, count in tier_counts:
+        counts[f'{tier}_count'] = count
+
+    counts['platinum_count'] = UserGame.query.filter_by(user_id=user_id, completion_percentage=100.0).count()
+    counts['total_games'] = UserGame.query.filter_by(user_id=user_id).count()
+    counts['games_with_trophies'] = db.session.query(
+        func.count(func.distinct(Achievement.game_id))
+    ).filter(Achievement.user_id == user_id, Achievement.unlocked == True).scalar() or 0
+    counts['total_achievements'] = Achievement.query.filter_by(user_id=user_id).count()
+    counts['unlocked_achievements'] = Achievement.query.filter_by(user_id=user_id, unlocked=True).count()
+    return counts
+
+
+def points_for(counts: Dict[str, int]) -> int:
+    return sum(points * counts.get(f'{tier}_count', 0) for tier, points in UserStats.TIER_POINTS.items())
+
+
+def get_user_stats(user: User) -> UserStats:
+    """Return the user's stats record, or an unsaved one counted on the spot if it is missing."""
+    if user.stats is not None:
+        return user.stats
+
+    counts = count_user_stats(user.id)
+    return UserStats(user_id=user.id, points=points_for(counts), **counts)
+
+
+def ensure_user_stats(user_id: int) -> UserStats:
+    """Get the user's stats record, creating it from a full count if missing. The caller commits."""
+    stats = db.session.get(UserStats, user_id)
+    if stats is not None:
+        return stats
+
+    counts = count_user_stats(user_id)
+    stats = UserStats(user_id=user_id, points=points_for(counts), reconciled_at=datetime.utcnow(), **counts)
+    try:
+        with db.session.begin_nested():
+            db.session.add(stats)
+    except IntegrityError:
+        stats = db.session.get(UserStats, user_id)
+    return stats
+
+
+def apply_user_stats_delta(user_id: int, **deltas: int):
+    """Add ``deltas`` to the user's counters with one atomic UPDATE in the caller's transaction.
+
+    Call it before writing the rows the deltas describe: a record that does
+    not exist yet is first created from a full count, which must not already
+    include them.
+    """
+    deltas = {column: delta for column, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    unknown = set(deltas) - set(COUNTER_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown user stats columns: {', '.join(sorted(unknown))}")
+
+    ensure_user_stats(user_id)
+
+    table = UserStats.__table__
+    values = {column: table.c[column] + delta for column, delta in deltas.items()}
+    points = points_for(deltas)
+    if points:
+        values['points'] = table.c.points + points
+    values['updated_at'] = datetime.utcnow()
+
+    db.session.execute(
+        update(UserStats).where(UserStats.user_id == user_id).values(values),
+        execution_options={'synchronize_session': False}
+    )
+    db.session.expire(db.session.get(UserStats, user_id))
+
+
+def tier_delta(before: Optional[str], after: Optional[str], tiers=COUNTED_TIERS) -> Dict[str, int]:
+    """Counter changes for an unlock moving from tier ``before`` to ``after`` (None = locked)."""
+    deltas = {}
+    if before in tiers:
+        deltas[f'{before}_count'] = deltas.get(f'{before}_count', 0) - 1
+    if after in tiers:
+        deltas[f'{after}_count'] = deltas.get(f'{after}_count', 0) + 1
+    return deltas
+
+
+def reconcile_user_stats(user_id: int) -> bool:
+    """Recount a user's stats record; returns True if it had drifted. The caller commits."""
+    counts = count_user_stats(user_id)
+    counts['points'] = points_for(counts)
+
+    stats = db.session.get(UserStats, user_id)
+    if stats is None:
+        db.session.add(UserStats(user_id=user_id, reconciled_at=datetime.utcnow(), **counts))
+        return True
+
+    drifted = any(getattr(stats, column) != value for column, value in counts.items())
+    if drifted:
+        logger.info(f"Repairing drifted stats for user {user_id}")
+        for column, value in counts.items():
+            setattr(stats, column, value)
+        stats.updated_at = datetime.utcnow()
+    stats.reconciled_at = datetime.utcnow()
+    return drifted
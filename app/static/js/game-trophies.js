@@ -1,21 +1,30 @@
 document.addEventListener('DOMContentLoaded', function() {
     const filterButtons = document.querySelectorAll('.filter-btn-compact');
-    const trophyEntries = document.querySelectorAll('.trophy-entry');
+    const trophyList = document.querySelector('.trophy-list-compact');
+    let activeFilter = 'all';
 
     filterButtons.forEach(button => {
         button.addEventListener('click', function() {
             filterButtons.forEach(btn => btn.classList.remove('active'));
             this.classList.add('active');
 
-            const filterValue = this.dataset.filter;
-            
-            trophyEntries.forEach(entry => {
-                const shouldShow = filterEntries(entry, filterValue);
-                entry.classList.toggle('hidden', !shouldShow);
-            });
+            activeFilter = this.dataset.filter;
+            applyFilter(document.querySelectorAll('.trophy-entry'));
         });
     });
 
+    const loadMoreTrigger = document.querySelector('.load-more');
+    if (loadMoreTrigger && trophyList) {
+        new LoadMore(loadMoreTrigger, trophyList, added => applyFilter(added));
+    }
+
+    function applyFilter(entries) {
+        entries.forEach(entry => {
+            const shouldShow = filterEntries(entry, activeFilter);
+            entry.classList.toggle('hidden', !shouldShow);
+        });
+    }
+
     function filterEntries(entry, filter) {
         switch(filter) {
             case 'all':
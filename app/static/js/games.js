@@ -1,17 +1,34 @@
 document.addEventListener('DOMContentLoaded', function() {
-    const gameCards = document.querySelectorAll('.game-card');
+    const gameList = document.querySelector('.game-list');
     const filterButtons = document.querySelectorAll('.filter-btn');
+    let activeSort = 'recent';
+    let activeFilter = 'all';
 
-    gameCards.forEach(card => {
-        card.addEventListener('click', function() {
-            const gameId = this.dataset.gameId;
-            if (gameId) {
-                window.location.href = `/games/${gameId}/trophies`;
+    function setupCards(cards) {
+        cards.forEach(card => {
+            card.addEventListener('click', function() {
+                const gameId = this.dataset.gameId;
+                if (gameId) {
+                    window.location.href = `/games/${gameId}/trophies`;
+                }
+            });
+            
+            card.style.cursor = 'pointer';
+        });
+    }
+
+    setupCards(document.querySelectorAll('.game-card'));
+
+    const loadMoreTrigger = document.querySelector('.load-more');
+    if (loadMoreTrigger && gameList) {
+        new LoadMore(loadMoreTrigger, gameList, added => {
+            setupCards(added);
+            if (activeSort !== 'recent') {
+                sortGames(activeSort);
             }
+            filterGames(activeFilter);
         });
-        
-        card.style.cursor = 'pointer';
-    });
+    }
 
     filterButtons.forEach(button => {
         button.addEventListener('click', function() {
@@ -21,20 +38,21 @@ document.addEventListener('DOMContentLoaded', function() {
             if (isSort) {
                 document.querySelectorAll('[data-sort]').forEach(btn => btn.classList.remove('active'));
                 this.classList.add('active');
-                sortGames(this.dataset.sort);
+                activeSort = this.dataset.sort;
+                sortGames(activeSort);
             }
 
             if (isFilter) {
                 document.querySelectorAll('[data-filter]').forEach(btn => btn.classList.remove('active'));
                 this.classList.add('active');
-                filterGames(this.dataset.filter);
+                activeFilter = this.dataset.filter;
+                filterGames(activeFilter);
             }
         });
     });
 
     function sortGames(sortBy) {
-        const gameList = document.querySelector('.game-list');
-        const cards = Array.from(gameCards);
+        const cards = Array.from(gameList.querySelectorAll('.game-card'));
 
         cards.sort((a, b) => {
             switch(sortBy) {
@@ -54,7 +72,7 @@ document.addEventListener('DOMContentLoaded', function() {
     }
 
     function filterGames(filterBy) {
-        gameCards.forEach(card => {
+        document.querySelectorAll('.game-card').forEach(card => {
             const shouldShow = filterBy === 'all' || card.dataset.filterCategory === filterBy;
             card.classList.toggle('hidden', !shouldShow);
         });
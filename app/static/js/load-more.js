@@ -0,0 +1,67 @@
+class LoadMore {
+    constructor(trigger, list, onAppend) {
+        this.trigger = trigger;
+        this.list = list;
+        this.onAppend = onAppend;
+        this.loading = false;
+
+        const button = trigger.querySelector('.load-more-btn');
+        if (button) {
+            button.addEventListener('click', () => this.load());
+        }
+
+        if ('IntersectionObserver' in window) {
+            this.observer = new IntersectionObserver(entries => {
+                if (entries.some(entry => entry.isIntersecting)) {
+                    this.load();
+                }
+            }, { rootMargin: '400px' });
+            this.observer.observe(trigger);
+        }
+    }
+
+    async load() {
+        const nextUrl = this.trigger.dataset.nextUrl;
+        if (this.loading || !nextUrl) return;
+
+        this.loading = true;
+        this.trigger.classList.add('loading');
+
+        try {
+            const response = await fetch(nextUrl, { headers: { 'Accept': 'application/json' } });
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}`);
+            }
+
+            const page = await response.json();
+            const template = document.createElement('template');
+            template.innerHTML = page.html;
+            const added = Array.from(template.content.children);
+            this.list.append(...added);
+
+            if (this.onAppend) {
+                this.onAppend(added);
+            }
+
+            if (page.next_url) {
+                this.trigger.dataset.nextUrl = page.next_url;
+            } else {
+                this.finish();
+            }
+        } catch (error) {
+            console.error('Error loading more results:', error);
+        } finally {
+            this.loading = false;
+            this.trigger.classList.remove('loading');
+        }
+    }
+
+    finish() {
+        if (this.observer) {
+            this.observer.disconnect();
+        }
+        this.trigger.remove();
+    }
+}
+
+window.LoadMore = LoadMore;
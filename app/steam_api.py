@@ -4,7 +4,7 @@ import requests
 import time
 from flask import current_app as app
 from app import db
-from app.models import User, Game, Achievement
+from app.models import User, UserGame, Achievement, AchievementDefinition
 from datetime import datetime
 from celery import current_task, shared_task
 from sqlalchemy.exc import SQLAlchemyError
@@ -13,6 +13,19 @@ from app.services import (
     TrophyService,
     steam_api_service
 )
+from app.services.achievement_writer import (
+    ACHIEVEMENT_UPDATE_COLUMNS,
+    DEFINITION_UPDATE_COLUMNS,
+    ensure_definition,
+    schema_version,
+    upsert_achievement_definitions,
+    upsert_achievements
+)
+from app.services.circuit_breaker import SteamAPIUnavailable
+from app.services.game_catalog import ensure_user_game
+from app.services.game_stats import GAME_TIERS, apply_game_stats_delta, summarize_game_achievements
+from app.services.steam_fetch_engine import SyncFetchContext
+from app.services.user_stats import apply_user_stats_delta, ensure_user_stats, tier_delta
 
 
 class SteamAPI:
@@ -50,101 +63,201 @@ class SteamAPI:
     def get_achievement_percentages(self, app_id):
         return self.api_service.get_achievement_percentages(app_id)
     
+    def get_cached_achievement_percentages(self, app_id):
+        return self.api_service.get_cached_achievement_percentages(app_id)
+    
     def get_game_schema(self, app_id):
         return self.api_service.get_game_schema(app_id)
     
-    def sync_achievements(self, user, game):
+    def sync_achievements(self, user, game, context=None):
+        """Reconcile a game's achievements, reading Steam data through the sync's fetch context."""
+        if context is None:
+            context = SyncFetchContext(self.api_service, user.steam_id)
+        
         print(f"    Getting achievement schema for {game.name} (ID: {game.steam_app_id})")
         
-        schema = self.get_game_schema(game.steam_app_id)
+        schema = context.get_game_schema(game.steam_app_id)
         if not schema:
             print(f"    No achievement schema found for {game.name}")
             return 0
         
         print(f"    Found {len(schema)} achievements in schema")
         
-        user_achievements = self.get_user_achievements(user.steam_id, game.steam_app_id)
+        user_achievements = context.get_user_achievements(game.steam_app_id)
         user_ach_dict = {ach['apiname']: ach for ach in user_achievements}
         
         print(f"    Found {len(user_achievements)} user achievements")
         
-        global_percentages = self.get_achievement_percentages(game.steam_app_id)
+        global_percentages = context.get_achievement_percentages(game.steam_app_id)
         print(f"    Found global percentages for {len(global_percentages)} achievements")
         
-        unlocked_count = 0
         total_count = len(schema)
-        achievements_processed = 0
         newly_unlocked_achievements = []
         
         previous_completion = game.completion_percentage
         was_completed = previous_completion == 100.0
         
+        version = schema_version(schema)
+        now = datetime.utcnow()
+        
+        ensure_user_stats(user.id)
+        
+        definition_columns = [column for column in DEFINITION_UPDATE_COLUMNS if column != 'updated_at']
+        existing_definitions = {
+            stored.api_name: stored._asdict()
+            for stored in db.session.query(
+                AchievementDefinition.api_name,
+                AchievementDefinition.id,
+                *(getattr(AchievementDefinition, column) for column in definition_columns)
+            ).filter(AchievementDefinition.app_id == game.steam_app_id)
+        }
+        
+        definition_rows = {}
         for ach_schema in schema:
             try:
                 ach_name = ach_schema['name']
-                
-                achievement = Achievement.query.filter_by(
-                    user_id=user.id,
-                    game_id=game.id,
-                    steam_achievement_id=ach_name
-                ).first()
-                
-                was_previously_unlocked = achievement.unlocked if achievement else False
-                
-                if not achievement:
-                    achievement = Achievement(
-                        user_id=user.id,
-                        game_id=game.id,
-                        steam_achievement_id=ach_name,
-                        name=ach_schema.get('displayName', ach_name),
-                        description=ach_schema.get('description', ''),
-                        icon_url=ach_schema.get('icon', ''),
-                        icon_gray_url=ach_schema.get('icongray', '')
-                    )
-                    db.session.add(achievement)
-                
-                achievement.name = ach_schema.get('displayName', ach_name)
-                achievement.description = ach_schema.get('description', '')
-                achievement.icon_url = ach_schema.get('icon', '')
-                achievement.icon_gray_url = ach_schema.get('icongray', '')
-                
-                achievement.global_percentage = float(global_percentages.get(ach_name, 100.0))
-                achievement.calculate_rarity_tier()
-                
-                if ach_name in user_ach_dict:
-                    user_ach = user_ach_dict[ach_name]
-                    if user_ach['achieved'] == 1:
-                        if not was_previously_unlocked:
-                            newly_unlocked_achievements.append(achievement)
-                            rarity_desc = TrophyService.get_tier_display_name(achievement.rarity_tier)
-                            print(f"      NEW TROPHY: {achievement.name} - {rarity_desc} ({achievement.global_percentage:.2f}%)")
-                        
-                        achievement.unlocked = True
-                        if user_ach['unlocktime'] > 0:
-                            achievement.unlock_time = datetime.fromtimestamp(user_ach['unlocktime'])
-                        unlocked_count += 1
-                        print(f"      ✓ {achievement.name} - {achievement.rarity_tier}")
-                    else:
-                        achievement.unlocked = False
-                        achievement.unlock_time = None
-                else:
-                    achievement.unlocked = False
-                    achievement.unlock_time = None
-                
-                achievements_processed += 1
-                
+                global_percentage = float(global_percentages.get(ach_name, 100.0))
+                definition_rows[ach_name] = {
+                    'app_id': game.steam_app_id,
+                    'api_name': ach_name,
+                    'name': ach_schema.get('displayName', ach_name),
+                    'description': ach_schema.get('description', ''),
+                    'icon_url': ach_schema.get('icon', ''),
+                    'icon_gray_url': ach_schema.get('icongray', ''),
+                    'global_percentage': global_percentage,
+                    'rarity_tier': AchievementDefinition.rarity_tier_for(global_percentage),
+                    'schema_version': version,
+                    'updated_at': now
+                }
             except Exception as e:
                 print(f"    Error processing achievement {ach_schema.get('name', 'Unknown')}: {e}")
                 continue
         
-        game.total_achievements = total_count
+        changed_definitions = [
+            row for ach_name, row in definition_rows.items()
+            if ach_name not in existing_definitions or
+            any(row[column] != existing_definitions[ach_name][column] for column in definition_columns)
+        ]
+        
+        try:
+            upsert_achievement_definitions(changed_definitions)
+        except SQLAlchemyError as e:
+            print(f"    Error writing achievement definitions: {e}")
+            db.session.rollback()
+            return 0
+        
+        if any(row['api_name'] not in existing_definitions for row in changed_definitions):
+            definition_ids = dict(
+                db.session.query(AchievementDefinition.api_name, AchievementDefinition.id)
+                .filter(AchievementDefinition.app_id == game.steam_app_id)
+            )
+        else:
+            definition_ids = {api_name: stored['id'] for api_name, stored in existing_definitions.items()}
+        
+        compared_columns = [column for column in ACHIEVEMENT_UPDATE_COLUMNS if column != 'updated_at']
+        existing_achievements = {
+            stored.definition_id: stored._asdict()
+            for stored in db.session.query(
+                Achievement.definition_id,
+                Achievement.id,
+                *(getattr(Achievement, column) for column in compared_columns)
+            ).filter(Achievement.user_id == user.id, Achievement.game_id == game.id)
+        }
+        
+        rows = {}
+        
+        for ach_name, definition in definition_rows.items():
+            definition_id = definition_ids[ach_name]
+            stored = existing_achievements.get(definition_id)
+            was_previously_unlocked = stored['unlocked'] if stored else False
+            
+            row = {
+                'user_id': user.id,
+                'game_id': game.id,
+                'definition_id': definition_id,
+                'unlocked': False,
+                'unlock_time': None,
+                'updated_at': now
+            }
+            
+            user_ach = user_ach_dict.get(ach_name)
+            if user_ach and user_ach['achieved'] == 1:
+                if not was_previously_unlocked:
+                    newly_unlocked_achievements.append(ach_name)
+                    rarity_desc = TrophyService.get_tier_display_name(definition['rarity_tier'])
+                    print(f"      NEW TROPHY: {definition['name']} - {rarity_desc} ({definition['global_percentage']:.2f}%)")
+                
+                row['unlocked'] = True
+                if user_ach['unlocktime'] > 0:
+                    row['unlock_time'] = datetime.fromtimestamp(user_ach['unlocktime'])
+                elif stored:
+                    row['unlock_time'] = stored['unlock_time']
+                print(f"      ✓ {definition['name']} - {definition['rarity_tier']}")
+            
+            rows[definition_id] = row
+        
+        achievements_processed = len(rows)
+        unlocked_count = sum(1 for row in rows.values() if row['unlocked'])
+        
+        changed_rows = [
+            row for definition_id, row in rows.items()
+            if definition_id not in existing_achievements or
+            any(row[column] != existing_achievements[definition_id][column] for column in compared_columns)
+        ]
+        
+        game.app.total_achievements = total_count
         game.unlocked_achievements = unlocked_count
         game.calculate_completion()
         
-        print(f"    Game {game.name}: {unlocked_count}/{total_count} achievements unlocked ({game.completion_percentage:.1f}%)")
+        stored_tiers = {stored['id']: stored['rarity_tier'] for stored in existing_definitions.values()}
+        stats_delta = {
+            'total_achievements': sum(1 for definition_id in rows if definition_id not in existing_achievements),
+            'unlocked_achievements': 0,
+            'platinum_count': int(game.completion_percentage == 100.0) - int(was_completed),
+            'games_with_trophies': (
+                int(any(row['unlocked'] for row in rows.values()) or
+                    any(stored['unlocked'] for definition_id, stored in existing_achievements.items()
+                        if definition_id not in rows)) -
+                int(any(stored['unlocked'] for stored in existing_achievements.values()))
+            )
+        }
+        for ach_name, definition in definition_rows.items():
+            definition_id = definition_ids[ach_name]
+            stored = existing_achievements.get(definition_id)
+            before = stored_tiers.get(definition_id, 'unknown') if stored and stored['unlocked'] else None
+            after = definition['rarity_tier'] if rows[definition_id]['unlocked'] else None
+            stats_delta['unlocked_achievements'] += int(after is not None) - int(before is not None)
+            for column, delta in tier_delta(before, after).items():
+                stats_delta[column] = stats_delta.get(column, 0) + delta
+        
+        final_tiers = dict(stored_tiers)
+        final_tiers.update((definition_ids[ach_name], definition['rarity_tier']) for ach_name, definition in definition_rows.items())
+        final_rows = dict(existing_achievements)
+        final_rows.update(rows)
+        game_stats = summarize_game_achievements(
+            (existing_achievements.get(definition_id, {}).get('id'), final_tiers.get(definition_id), row['unlocked'], row['unlock_time'])
+            for definition_id, row in final_rows.items()
+        )
+        latest_definition_id = next(
+            (definition_id for definition_id, row in final_rows.items()
+             if row['unlocked'] and row['unlock_time'] is not None and row['unlock_time'] == game_stats['latest_unlock_time']),
+            None
+        )
+        
+        print(f"    Game {game.name}: {unlocked_count}/{total_count} achievements unlocked ({game.completion_percentage:.1f}%), {len(changed_rows)} changed")
         
         try:
+            apply_user_stats_delta(user.id, **stats_delta)
+            upsert_achievements(changed_rows)
+            if latest_definition_id is not None and game_stats['latest_unlock_id'] is None:
+                game_stats['latest_unlock_id'] = db.session.query(Achievement.id).filter_by(
+                    user_id=user.id, definition_id=latest_definition_id
+                ).scalar()
+            for column, value in game_stats.items():
+                setattr(game, column, value)
             db.session.commit()
+            context.achievements_changed += len(changed_rows)
+            context.definitions_changed += len(changed_definitions)
         except SQLAlchemyError as e:
             print(f"    Error committing changes: {e}")
             db.session.rollback()
@@ -161,34 +274,54 @@ class SteamAPI:
     def _handle_game_completion(self, user, game):
         """Handle platinum trophy creation for game completion."""
         try:
+            definition = ensure_definition(
+                game.steam_app_id,
+                f'PLATINUM_{game.steam_app_id}',
+                name=f'{game.name} - Master',
+                description=f'Unlock all achievements in {game.name}',
+                icon_url=game.header_image or '/static/images/platinum_trophy.png',
+                icon_gray_url=game.header_image or '/static/images/platinum_trophy_gray.png',
+                global_percentage=1.0,
+                rarity_tier='platinum'
+            )
+            
             platinum_trophy = Achievement.query.filter_by(
                 user_id=user.id,
-                game_id=game.id,
-                steam_achievement_id=f'PLATINUM_{game.steam_app_id}'
+                definition_id=definition.id
             ).first()
             
             if not platinum_trophy:
+                apply_user_stats_delta(user.id, total_achievements=1, unlocked_achievements=1)
                 platinum_trophy = Achievement(
                     user_id=user.id,
                     game_id=game.id,
-                    steam_achievement_id=f'PLATINUM_{game.steam_app_id}',
-                    name=f'{game.name} - Master',
-                    description=f'Unlock all achievements in {game.name}',
-                    icon_url=game.header_image or '/static/images/platinum_trophy.png',
-                    icon_gray_url=game.header_image or '/static/images/platinum_trophy_gray.png',
-                    global_percentage=1.0,
-                    rarity_tier='platinum',
+                    definition=definition,
                     unlocked=True,
                     unlock_time=datetime.utcnow()
                 )
                 db.session.add(platinum_trophy)
                 db.session.flush()
+                apply_game_stats_delta(
+                    game,
+                    unlock=(platinum_trophy.unlock_time, platinum_trophy.id),
+                    achievement_count=1,
+                    unlocked_count=1,
+                    **tier_delta(None, definition.rarity_tier, GAME_TIERS)
+                )
                 
                 print(f"      PLATINUM TROPHY CREATED: {platinum_trophy.name}")
             else:
                 if not platinum_trophy.unlocked:
+                    apply_user_stats_delta(user.id, unlocked_achievements=1)
                     platinum_trophy.unlocked = True
                     platinum_trophy.unlock_time = datetime.utcnow()
+                    db.session.flush()
+                    apply_game_stats_delta(
+                        game,
+                        unlock=(platinum_trophy.unlock_time, platinum_trophy.id),
+                        unlocked_count=1,
+                        **tier_delta(None, platinum_trophy.rarity_tier, GAME_TIERS)
+                    )
                     print(f"      PLATINUM TROPHY RE-UNLOCKED: {platinum_trophy.name}")
                 else:
                     print(f"      PLATINUM TROPHY ALREADY UNLOCKED: {platinum_trophy.name}")
@@ -203,39 +336,35 @@ class SteamAPI:
 steam_api = SteamAPI()
 
 
-def sync_single_game_sync(user, game_data):
+def sync_single_game_sync(user, game_data, context=None):
     app_id = game_data['appid']
     game_name = game_data.get('name', f'Game {app_id}')
     
     print(f"  Syncing game: {game_name} (ID: {app_id})")
     
+    if context is None:
+        context = SyncFetchContext(steam_api.api_service, user.steam_id)
+    
     playtime = game_data.get('playtime_forever', 0)
     if playtime == 0:
-        schema = steam_api.get_game_schema(app_id)
+        schema = context.get_game_schema(app_id)
         if not schema:
             print(f"  Skipping {game_name} - no playtime and no achievements")
+            context.forget(app_id)
             return False
     
     try:
-        game = Game.query.filter_by(user_id=user.id, steam_app_id=app_id).first()
-        if not game:
-            game = Game(
-                user_id=user.id,
-                steam_app_id=app_id,
-                name=game_name,
-                header_image=f"https://steamcdn-a.akamaihd.net/steam/apps/{app_id}/header.jpg"
-            )
-            db.session.add(game)
-            db.session.flush()
+        game = ensure_user_game(user.id, app_id, game_name, refresh_name=True)
         
-        game.name = game_name
         game.playtime_forever = game_data.get('playtime_forever', 0)
         game.playtime_2weeks = game_data.get('playtime_2weeks', 0)
         
         if 'rtime_last_played' in game_data and game_data['rtime_last_played'] > 0:
             game.last_played = datetime.fromtimestamp(game_data['rtime_last_played'])
+        game.rtime_last_played = game_data.get('rtime_last_played', 0)
+        game.update_last_synced()
         
-        achievements_synced = steam_api.sync_achievements(user, game)
+        achievements_synced = steam_api.sync_achievements(user, game, context=context)
         
         if achievements_synced > 0:
             print(f"  ✓ {game_name}: {achievements_synced} achievements synced")
@@ -244,6 +373,14 @@ def sync_single_game_sync(user, game_data):
             print(f"  - {game_name}: No achievements to sync")
             return False
             
+    except SteamAPIUnavailable:
+        db.session.rollback()
+        raise
+    except requests.RequestException as e:
+        # A failed player or percentage fetch must fail the game, not sync it as empty.
+        print(f"  Steam API error syncing {game_name}: {e}")
+        db.session.rollback()
+        raise
     except SQLAlchemyError as e:
         print(f"  Database error syncing {game_name}: {e}")
         db.session.rollback()
@@ -251,4 +388,6 @@ def sync_single_game_sync(user, game_data):
     except Exception as e:
         print(f"  Error syncing {game_name}: {e}")
         db.session.rollback()
-        return False
\ No newline at end of file
+        return False
+    finally:
+        context.forget(app_id)
\ No newline at end of file
@@ -1,13 +1,14 @@
 """Task utilities for managing Celery tasks and progress tracking."""
 
 import json
+import time
 from datetime import datetime, timedelta
 from enum import Enum
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, fields
 from typing import Dict, List, Any, Optional, Union
-from celery import current_app
 from celery.result import AsyncResult
 from celery.states import SUCCESS, FAILURE, PENDING, STARTED, RETRY, REVOKED
+from flask import current_app
 
 from app import celery, db
 from app.models import User
@@ -27,6 +28,7 @@ class SyncType(Enum):
     FULL = 'full'
     QUICK = 'quick'
     SPECIFIC = 'specific'
+    INCREMENTAL = 'incremental'
     ACHIEVEMENT_REFRESH = 'achievement_refresh'
     USER_STATS = 'user_stats'
     BATCH = 'batch'
@@ -44,13 +46,15 @@ class TaskProgress:
     start_time: Optional[str] = None
     current_game: Optional[str] = None
     sync_type: Optional[str] = None
+    pipeline: Optional[Dict[str, Any]] = None
     
     def to_dict(self) -> Dict[str, Any]:
         return asdict(self)
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'TaskProgress':
-        return cls(**data)
+        known = {f.name for f in fields(cls)}
+        return cls(**{key: value for key, value in data.items() if key in known})
     
     @property
     def percentage(self) -> float:
@@ -139,7 +143,8 @@ class TaskManager:
                         'failed_games': progress.failed_games,
                         'current_game': progress.current_game,
                         'sync_type': progress.sync_type,
-                        'start_time': progress.start_time
+                        'start_time': progress.start_time,
+                        'pipeline': progress.pipeline
                     })
                 else:
                     response.update({
@@ -290,12 +295,73 @@ class TaskManager:
             }
 
 
+class ProgressPublisher:
+    """Coalesce PROGRESS writes to the result backend.
+
+    Each ``publish`` replaces the pending meta, which is written only when
+    ``interval`` seconds have passed since the last write, the percentage has
+    moved by ``threshold`` points, or the caller forces it (phase changes,
+    completion). The first publish always goes out.
+    """
+    
+    def __init__(self, task, task_id: str = None, interval: float = None, threshold: float = None):
+        if interval is None or threshold is None:
+            try:
+                config = current_app.config
+            except RuntimeError:
+                config = {}
+            if interval is None:
+                interval = config.get('PROGRESS_UPDATE_INTERVAL', 2)
+            if threshold is None:
+                threshold = config.get('PROGRESS_UPDATE_THRESHOLD', 5)
+        
+        self.task = task
+        self.task_id = task_id
+        self.interval = interval
+        self.threshold = threshold
+        self.writes = 0
+        self.coalesced = 0
+        self._pending = None
+        self._last_write = None
+        self._last_percent = 0.0
+    
+    def publish(self, meta: Dict[str, Any], force: bool = False):
+        self._pending = meta
+        percent = meta.get('percent', 0) or 0
+        
+        if (force or self._last_write is None or
+                time.monotonic() - self._last_write >= self.interval or
+                abs(percent - self._last_percent) >= self.threshold):
+            self.flush()
+        else:
+            self.coalesced += 1
+    
+    def flush(self):
+        if self._pending is None:
+            return
+        
+        meta, self._pending = self._pending, None
+        if self.task_id:
+            self.task.update_state(task_id=self.task_id, state='PROGRESS', meta=meta)
+        else:
+            self.task.update_state(state='PROGRESS', meta=meta)
+        
+        self.writes += 1
+        self._last_write = time.monotonic()
+        self._last_percent = meta.get('percent', 0) or 0
+    
+    def get_stats(self) -> Dict[str, int]:
+        return {'progress_writes': self.writes, 'progress_coalesced': self.coalesced}
+
+
 class ProgressTracker:
     
-    def __init__(self, task, total_items: int, initial_status: str = 'Starting...'):
+    def __init__(self, task, total_items: int, initial_status: str = 'Starting...',
+                 publisher: ProgressPublisher = None):
         self.task = task
         self.total_items = total_items
         self.current_item = 0
+        self.publisher = publisher or ProgressPublisher(task)
         self.progress = TaskProgress(
             total=total_items,
             status=initial_status,
@@ -308,6 +374,8 @@ class ProgressTracker:
         if increment:
             self.current_item += 1
         
+        phase_changed = bool(phase) and phase != self.progress.phase
+        
         if status:
             self.progress.status = status
         if phase:
@@ -317,10 +385,20 @@ class ProgressTracker:
         
         self.progress.current = self.current_item
         
-        self.task.update_state(
-            state='PROGRESS',
-            meta=self.progress.to_dict()
-        )
+        self.publisher.publish(self.to_meta(), force=phase_changed)
+    
+    def to_meta(self) -> Dict[str, Any]:
+        """TaskProgress fields plus the keys /api/task-status reads for sync tasks."""
+        meta = self.progress.to_dict()
+        meta.update({
+            'percent': int(self.progress.percentage),
+            'games_failed': self.progress.failed_games,
+            'total_games': self.progress.total,
+            'current_index': self.progress.current,
+            'duration_seconds': self.get_duration_seconds(),
+            'avg_games_per_second': self.get_rate()
+        })
+        return meta
     
     def increment_synced(self):
         self.progress.games_synced += 1
@@ -338,10 +416,8 @@ class ProgressTracker:
         self.update_progress(phase=phase, status=status)
     
     def complete(self, final_status: str = 'Completed'):
-        self.progress.current = self.progress.total
-        self.progress.status = final_status
-        self.progress.phase = 'completed'
-        self.update_progress()
+        self.current_item = self.progress.total
+        self.update_progress(status=final_status, phase='completed')
     
     def get_duration_seconds(self) -> float:
         if not self.progress.start_time:
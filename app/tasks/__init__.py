@@ -4,10 +4,20 @@ from .sync_tasks import (
     full_steam_sync,
     quick_steam_sync,
     sync_specific_games,
+    incremental_steam_sync,
+    schedule_incremental_syncs,
+    sync_game_chunk,
+    finalize_full_sync,
+    start_user_sync,
 )
 
 from .stats_tasks import (
     calculate_user_stats,
+    reconcile_user_stats_task,
+)
+
+from .achievement_tasks import (
+    refresh_global_percentages,
 )
 
 from .health_tasks import (
@@ -18,6 +28,13 @@ __all__ = [
     'full_steam_sync',
     'quick_steam_sync',
     'sync_specific_games',
+    'incremental_steam_sync',
+    'schedule_incremental_syncs',
+    'sync_game_chunk',
+    'finalize_full_sync',
+    'start_user_sync',
     'calculate_user_stats',
+    'reconcile_user_stats_task',
+    'refresh_global_percentages',
     'health_check',
 ]
\ No newline at end of file
@@ -1,9 +1,13 @@
-
 """Achievement refresh and management tasks."""
 
 import logging
+from datetime import datetime
+
+import requests
 from flask import current_app
-from app import create_app
+from app import celery, create_app
+from app.services.circuit_breaker import SteamAPIUnavailable
+from app.services.steam_api_service import init_steam_api_service
 
 logger = logging.getLogger(__name__)
 
@@ -12,4 +16,52 @@ def get_flask_app():
     try:
         return current_app._get_current_object()
     except RuntimeError:
-        return create_app()
\ No newline at end of file
+        return create_app()
+
+
+@celery.task(bind=True)
+def refresh_global_percentages(self, limit=None):
+    """Refresh cached global achievement percentages for the hottest apps.
+
+    Runs on the beat schedule so the sync hot path can read percentages from
+    the cache without calling Steam.
+    """
+    app = get_flask_app()
+    with app.app_context():
+        limit = int(limit or app.config.get('STEAM_PERCENTAGES_REFRESH_LIMIT', 500))
+        service = init_steam_api_service()
+        cache = service.percentages_cache
+
+        refreshed = 0
+        skipped = 0
+        failed = []
+
+        for app_id in cache.hottest(limit):
+            entry = cache.get_entry(app_id)
+            if entry is not None and cache.is_fresh(entry):
+                skipped += 1
+                continue
+
+            try:
+                if service.refresh_achievement_percentages(app_id):
+                    refreshed += 1
+                else:
+                    skipped += 1
+            except SteamAPIUnavailable as e:
+                logger.warning(f"Stopping global percentages refresh: {e}")
+                break
+            except requests.RequestException as e:
+                logger.warning(f"Could not refresh global percentages for app {app_id}: {e}")
+                failed.append(app_id)
+
+        cache.decay_hits()
+
+        logger.info(f"Global percentages refresh: {refreshed} refreshed, {skipped} skipped, {len(failed)} failed")
+
+        return {
+            'status': 'completed',
+            'refreshed': refreshed,
+            'skipped': skipped,
+            'failed_app_ids': failed,
+            'completion_time': datetime.utcnow().isoformat()
+        }
@@ -5,7 +5,9 @@ from datetime import datetime, timedelta
 
 from flask import current_app
 from app import db, celery, create_app
-from app.models import User, Game, Achievement
+from app.models import User, UserGame, SteamApp, Achievement
+from app.services.game_stats import reconcile_game_stats
+from app.services.user_stats import ensure_user_stats, reconcile_user_stats
 from app.task_utils import ProgressTracker, TaskResult
 
 logger = logging.getLogger(__name__)
@@ -41,7 +43,8 @@ def calculate_user_stats(self, user_id):
                 }
             )
             
-            trophy_counts = user.get_trophy_counts()
+            user_stats = ensure_user_stats(user.id)
+            trophy_counts = user_stats.trophy_counts()
             
             self.update_state(
                 state='PROGRESS',
@@ -53,9 +56,9 @@ def calculate_user_stats(self, user_id):
                 }
             )
             
-            total_games = user.games.filter(Game.total_achievements > 0).count()
-            total_achievements = user.achievements.count()
-            unlocked_achievements = user.achievements.filter_by(unlocked=True).count()
+            total_games = user.games.join(UserGame.app).filter(SteamApp.total_achievements > 0).count()
+            total_achievements = user_stats.total_achievements
+            unlocked_achievements = user_stats.unlocked_achievements
             
             completion_rate = (unlocked_achievements / total_achievements * 100) if total_achievements > 0 else 0
             
@@ -100,6 +103,7 @@ def calculate_user_stats(self, user_id):
                 'achievement_velocity': round(achievement_velocity, 2),
                 'calculation_time': datetime.utcnow().isoformat()
             }
+            db.session.commit()
             
             result_obj = TaskResult(
                 status='completed',
@@ -114,4 +118,45 @@ def calculate_user_stats(self, user_id):
         except Exception as e:
             logger.error(f"Error in calculate_user_stats: {e}", exc_info=True)
             
-            raise e
\ No newline at end of file
+            raise e
+
+
+@celery.task(bind=True)
+def reconcile_user_stats_task(self, user_id=None):
+    """Recount the denormalized user and game trophy totals and repair any that drifted.
+
+    Catches what the incremental updates miss, such as a global percentages
+    refresh moving a definition into another tier for every owner at once.
+    """
+    app = get_flask_app()
+    with app.app_context():
+        if user_id is not None:
+            user_ids = [user_id]
+        else:
+            user_ids = [row.id for row in db.session.query(User.id).order_by(User.id)]
+
+        drifted = 0
+        games_drifted = 0
+        failed = []
+
+        for uid in user_ids:
+            try:
+                if reconcile_user_stats(uid):
+                    drifted += 1
+                games_drifted += reconcile_game_stats(uid)
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                logger.warning(f"Could not reconcile stats for user {uid}: {e}")
+                failed.append(uid)
+
+        logger.info(f"User stats reconciliation: {len(user_ids)} checked, {drifted} repaired, {games_drifted} games repaired, {len(failed)} failed")
+
+        return {
+            'status': 'completed',
+            'checked': len(user_ids),
+            'drifted': drifted,
+            'games_drifted': games_drifted,
+            'failed_user_ids': failed,
+            'completion_time': datetime.utcnow().isoformat()
+        }
@@ -1,21 +1,43 @@
 """Steam library sync tasks."""
 
-import time
 import logging
 from datetime import datetime, timedelta
+import redis
 import requests
+from celery import chord, group, states
+from celery.exceptions import Ignore
+from celery.result import AsyncResult
+from celery.utils import uuid
 from sqlalchemy.exc import SQLAlchemyError
 
 from flask import current_app
 from app import db, celery, create_app
-from app.models import User, Game
+from app.models import SteamApp, User, UserGame
 from app.steam_api import steam_api, sync_single_game_sync
 
-from .helpers import SyncTaskHelper
+from .helpers import SyncTaskHelper, TaskConfig
+from app.task_utils import ProgressPublisher, TaskResult
+from app.services.circuit_breaker import SteamAPIUnavailable
+from app.services.redis_store import get_steam_redis, report_redis_failure
+from app.services.sync_checkpoint import SyncCheckpoint
+from app.services.sync_lock import UserSyncLock
+from app.services.steam_fetch_engine import SteamFetchEngine, SyncFetchContext
 from app.services.trophy_detection import check_for_platinum_trophy
 
 logger = logging.getLogger(__name__)
 
+COUNT_CHUNK_GAME_SCRIPT = """
+local added = redis.call('SADD', KEYS[2], ARGV[1])
+redis.call('EXPIRE', KEYS[2], ARGV[3])
+if added == 1 then
+    redis.call('HINCRBY', KEYS[1], 'current', 1)
+    redis.call('HINCRBY', KEYS[1], ARGV[2], 1)
+end
+return redis.call('HGETALL', KEYS[1])
+"""
+
+_count_chunk_game_script = None
+
 
 def get_flask_app():
     """Get or create Flask app instance for Celery context."""
@@ -25,10 +47,167 @@ def get_flask_app():
         return create_app()
 
 
-@celery.task(bind=True, autoretry_for=(requests.RequestException, SQLAlchemyError), 
+class UserSyncTask(celery.Task):
+    """Base for sync tasks that own a user's sync lock while they run.
+
+    A task whose lock was handed to another sync before it started (a full
+    sync absorbing a queued quick sync) returns a ``superseded`` result
+    instead of running alongside the new owner. Retries restart the lock's
+    TTL so the countdown cannot outlive it.
+    """
+
+    @staticmethod
+    def _user_id(args, kwargs):
+        return kwargs.get('user_id', args[0] if args else None)
+
+    def __call__(self, *args, **kwargs):
+        user_id = self._user_id(args, kwargs)
+        if user_id is not None and not self.request.called_directly:
+            with get_flask_app().app_context():
+                held = UserSyncLock(user_id).holder()
+            if held is not None and held[0] != self.request.id:
+                held_task_id, held_sync_type = held
+                logger.info(f"Sync {self.request.id} for user {user_id} superseded by {held_sync_type} sync {held_task_id}")
+                return TaskResult(
+                    status='superseded',
+                    message=f'Superseded by {held_sync_type} sync {held_task_id}'
+                ).to_dict()
+        return super().__call__(*args, **kwargs)
+
+    def on_retry(self, exc, task_id, args, kwargs, einfo):
+        user_id = self._user_id(args, kwargs)
+        if user_id is None:
+            return
+        with get_flask_app().app_context():
+            UserSyncLock(user_id).extend(task_id)
+
+    def after_return(self, status, retval, task_id, args, kwargs, einfo):
+        if status not in (states.SUCCESS, states.FAILURE):
+            return
+        user_id = self._user_id(args, kwargs)
+        if user_id is None:
+            return
+        with get_flask_app().app_context():
+            UserSyncLock(user_id).release(task_id)
+
+
+def _fan_out_progress_key(parent_task_id):
+    return f"steam_sync_progress:{parent_task_id}"
+
+
+def _fan_out_counted_key(parent_task_id):
+    return f"steam_sync_progress:{parent_task_id}:counted"
+
+
+def _seconds_since(start_time):
+    try:
+        return (datetime.utcnow() - datetime.fromisoformat(start_time)).total_seconds()
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _fan_out_full_sync(task, user_id, games_to_sync, tracker, chunk_size, no_stats_skipped):
+    """Build a chord that syncs ``games_to_sync`` in parallel chunks.
+
+    Games are dealt round-robin so the heavily played titles at the front of
+    the list spread across chunks. Chunks add their progress to a Redis hash,
+    counting each app once even when a chunk retries, and publish the
+    combined totals under the parent task id; the chord callback takes over
+    that id when the parent replaces itself.
+    """
+    parent_task_id = task.request.id
+    progress = tracker.progress
+    chunk_count = -(-len(games_to_sync) // chunk_size)
+    chunks = [games_to_sync[index::chunk_count] for index in range(chunk_count)]
+
+    client = get_steam_redis()
+    if client is not None:
+        key = _fan_out_progress_key(parent_task_id)
+        try:
+            pipe = client.pipeline()
+            pipe.delete(key, _fan_out_counted_key(parent_task_id))
+            pipe.hset(key, mapping={
+                'total': progress.total,
+                'current': progress.current,
+                'games_synced': progress.games_synced,
+                'games_skipped': progress.games_skipped,
+                'games_failed': progress.failed_games,
+                'start_time': progress.start_time
+            })
+            pipe.expire(key, current_app.config.get('STEAM_SYNC_PROGRESS_TTL', 86400))
+            pipe.execute()
+        except redis.RedisError as e:
+            report_redis_failure(e)
+
+    tracker.set_phase('syncing', f"Syncing {len(games_to_sync)} games in {chunk_count} parallel chunks...")
+
+    header = group(sync_game_chunk.s(user_id, chunk, parent_task_id) for chunk in chunks)
+    callback = finalize_full_sync.s(
+        user_id,
+        total=progress.total,
+        games_skipped=progress.games_skipped,
+        no_stats_skipped=no_stats_skipped,
+        start_time=progress.start_time
+    )
+    return chord(header, callback)
+
+
+def _publish_chunk_progress(publisher, parent_task_id, app_id, game_name, outcome):
+    """Count one finished game and publish the combined progress of all chunks.
+
+    Apps a retried chunk already counted are not counted again.
+    """
+    global _count_chunk_game_script
+    client = get_steam_redis()
+    if client is None:
+        return
+
+    try:
+        if _count_chunk_game_script is None:
+            _count_chunk_game_script = client.register_script(COUNT_CHUNK_GAME_SCRIPT)
+        fields = _count_chunk_game_script(
+            keys=[_fan_out_progress_key(parent_task_id), _fan_out_counted_key(parent_task_id)],
+            args=[app_id, outcome, current_app.config.get('STEAM_SYNC_PROGRESS_TTL', 86400)]
+        )
+    except redis.RedisError as e:
+        report_redis_failure(e)
+        return
+    progress = dict(zip(fields[::2], fields[1::2]))
+
+    total = int(progress.get('total') or 1)
+    current = int(progress.get('current') or 0)
+    duration = _seconds_since(progress.get('start_time'))
+    publisher.publish({
+        'percent': int(current / total * 100),
+        'current_game': game_name,
+        'games_synced': int(progress.get('games_synced') or 0),
+        'games_skipped': int(progress.get('games_skipped') or 0),
+        'games_failed': int(progress.get('games_failed') or 0),
+        'total_games': total,
+        'current_index': current,
+        'phase': 'syncing',
+        'status': f'Syncing {game_name}...',
+        'sync_type': 'full',
+        'start_time': progress.get('start_time'),
+        'duration_seconds': duration,
+        'avg_games_per_second': current / duration if duration > 0 else 0
+    })
+
+
+@celery.task(bind=True, base=UserSyncTask, autoretry_for=(requests.RequestException, SQLAlchemyError), 
              retry_kwargs={'max_retries': 3, 'countdown': 60})
-def full_steam_sync(self, user_id, force_refresh=False):
-    """Complete Steam library sync with all games and achievements."""
+def full_steam_sync(self, user_id, force_refresh=False, fan_out=None):
+    """Complete Steam library sync with all games and achievements.
+
+    With ``fan_out`` (default ``STEAM_SYNC_FAN_OUT``) a library larger than
+    one chunk is split into ``sync_game_chunk`` subtasks and this task is
+    replaced by the chord, so the task id keeps reporting progress and ends
+    with the aggregated result.
+
+    The serial path checkpoints its work list and cursor under the task id,
+    so a retry or a redelivery after a worker restart resumes where the last
+    run stopped.
+    """
     app = get_flask_app()
     with app.app_context():
         try:
@@ -45,28 +224,92 @@ def full_steam_sync(self, user_id, force_refresh=False):
             games_data = sorted(games_data, key=lambda x: x.get('playtime_forever', 0), reverse=True)
             tracker = helper.start_sync(len(games_data), "Beginning complete Steam library sync...")
 
-            for i, game_data in enumerate(games_data):
+            checkpoint = SyncCheckpoint(self.request.id)
+            resumed = checkpoint.load(user_id)
+
+            games_to_sync = []
+            if resumed:
+                games_by_app = {game_data['appid']: game_data for game_data in games_data}
+                cursor = resumed['cursor']
+                games_to_sync = [
+                    games_by_app[app_id] for app_id in resumed['app_ids'][cursor:]
+                    if app_id in games_by_app
+                ]
+                no_stats_skipped = resumed['no_stats_skipped']
+
+                tracker.current_item = resumed['current']
+                tracker.progress.games_synced = resumed['games_synced']
+                tracker.progress.games_skipped = resumed['games_skipped']
+                tracker.progress.failed_games = resumed['games_failed']
+                tracker.progress.start_time = resumed['start_time'] or tracker.progress.start_time
+                tracker.set_phase('syncing', f"Resuming sync at game {cursor + 1} of {len(resumed['app_ids'])}...")
+                logger.info(f"Resuming full_steam_sync for user {user_id} at {cursor}/{len(resumed['app_ids'])}")
+            elif force_refresh:
+                games_to_sync = games_data
+            else:
+                last_synced_by_app = dict(
+                    db.session.query(UserGame.steam_app_id, UserGame.last_synced)
+                    .filter(UserGame.user_id == user.id)
+                    .all()
+                )
+                recent_cutoff = datetime.utcnow() - timedelta(days=7)
+
+                for game_data in games_data:
+                    last_synced = last_synced_by_app.get(game_data['appid'])
+                    if (last_synced and last_synced > recent_cutoff and
+                        game_data.get('playtime_2weeks', 0) == 0):
+                        helper.update_progress(game_data.get("name", f"Game {game_data.get('appid')}"))
+                        tracker.increment_skipped()
+                        continue
+                    games_to_sync.append(game_data)
+
+            if not resumed:
+                cursor = 0
+                unplayed_app_ids = [g['appid'] for g in games_to_sync if g.get('playtime_forever', 0) == 0]
+                no_stats_app_ids = steam_api.api_service.no_stats_cache.filter_members(unplayed_app_ids)
+                no_stats_skipped = len(no_stats_app_ids)
+                if no_stats_app_ids:
+                    remaining = []
+                    for game_data in games_to_sync:
+                        if game_data['appid'] in no_stats_app_ids:
+                            helper.update_progress(game_data.get("name", f"Game {game_data.get('appid')}"))
+                            tracker.increment_skipped()
+                        else:
+                            remaining.append(game_data)
+                    games_to_sync = remaining
+
+            if fan_out is None:
+                fan_out = app.config.get('STEAM_SYNC_FAN_OUT', False)
+            chunk_size = max(1, app.config.get('STEAM_SYNC_CHUNK_SIZE', 25))
+            if fan_out and len(games_to_sync) > chunk_size:
+                checkpoint.clear()
+                return self.replace(_fan_out_full_sync(
+                    self, user_id, games_to_sync, tracker, chunk_size, no_stats_skipped
+                ))
+
+            if not resumed:
+                checkpoint.start(
+                    user_id,
+                    [game_data['appid'] for game_data in games_to_sync],
+                    tracker.progress.start_time,
+                    current=tracker.current_item,
+                    games_skipped=tracker.progress.games_skipped,
+                    no_stats_skipped=no_stats_skipped
+                )
+
+            context = SyncFetchContext(steam_api.api_service, user.steam_id)
+            engine = SteamFetchEngine.from_config()
+
+            for position, (game_data, payload) in enumerate(engine.iter_payloads(context, games_to_sync), cursor + 1):
                 try:
                     game_name = game_data.get("name", f"Game {game_data.get('appid')}")
-                    helper.update_progress(game_name)
-
-                    if not force_refresh:
-                        existing_game = Game.query.filter_by(
-                            user_id=user.id, 
-                            steam_app_id=game_data['appid']
-                        ).first()
-                        
-                        if (existing_game and existing_game.last_synced and 
-                            existing_game.last_synced > datetime.utcnow() - timedelta(days=7) and
-                            game_data.get('playtime_2weeks', 0) == 0):
-                            tracker.increment_skipped()
-                            continue
+                    helper.update_progress(game_name, pipeline=engine.stats.to_dict())
 
-                    success = sync_single_game_sync(user, game_data)
+                    success = sync_single_game_sync(user, game_data, context=context)
                     if success:
                         tracker.increment_synced()
                         
-                        game = Game.query.filter_by(
+                        game = UserGame.query.filter_by(
                             user_id=user.id, 
                             steam_app_id=game_data['appid']
                         ).first()
@@ -75,29 +318,27 @@ def full_steam_sync(self, user_id, force_refresh=False):
                     else:
                         tracker.increment_skipped()
 
-                    time.sleep(0.5)
-
-                    if (i + 1) % 10 == 0:
+                    processed = tracker.progress.current
+                    if processed % 10 == 0:
                         db.session.commit()
+                        UserSyncLock(user_id).extend(self.request.id)
+                        checkpoint.advance(
+                            position,
+                            current=processed,
+                            games_synced=tracker.progress.games_synced,
+                            games_skipped=tracker.progress.games_skipped,
+                            games_failed=tracker.progress.failed_games
+                        )
                         
-                        self.update_state(
-                            state='PROGRESS',
-                            meta={
-                                'percent': int((i + 1) / len(games_data) * 100),
-                                'current_game': game_name,
-                                'games_synced': tracker.progress.games_synced,
-                                'games_skipped': tracker.progress.games_skipped,
-                                'games_failed': tracker.progress.games_failed,
-                                'total_games': len(games_data),
-                                'current_index': i + 1,
-                                'phase': 'syncing',
-                                'status': f"Processed {i + 1}/{len(games_data)} games...",
-                                'duration_seconds': tracker.get_duration_seconds(),
-                                'avg_games_per_second': tracker.get_rate()
-                            }
+                        tracker.progress.pipeline = engine.stats.to_dict()
+                        tracker.update_progress(
+                            status=f"Processed {processed}/{len(games_data)} games...",
+                            phase='syncing'
                         )
                         
 
+                except SteamAPIUnavailable:
+                    raise
                 except Exception as e:
                     logger.error(f"Error syncing game {game_data.get('name', 'Unknown')}: {e}")
                     tracker.increment_failed()
@@ -105,6 +346,7 @@ def full_steam_sync(self, user_id, force_refresh=False):
 
             user.last_sync = datetime.utcnow()
             db.session.commit()
+            checkpoint.clear()
 
             tracker.set_phase('finalizing', 'Calculating user statistics...')
 
@@ -119,10 +361,22 @@ def full_steam_sync(self, user_id, force_refresh=False):
                 total=len(games_data),
                 stats={
                     'duration_seconds': tracker.get_duration_seconds(),
-                    'avg_games_per_second': tracker.get_rate()
+                    'avg_games_per_second': tracker.get_rate(),
+                    'no_stats_skipped': no_stats_skipped,
+                    'resumed_from': cursor,
+                    'pipeline': engine.stats.to_dict(),
+                    **tracker.publisher.get_stats(),
+                    **context.get_stats()
                 }
             )
 
+        except Ignore:
+            raise
+
+        except SteamAPIUnavailable as e:
+            logger.warning(f"Pausing full_steam_sync for user {user_id}: {e}")
+            raise self.retry(exc=e, countdown=e.retry_after, max_retries=TaskConfig.STEAM_OUTAGE_MAX_RETRIES)
+
         except Exception as e:
             logger.error(f"Error in full_steam_sync: {e}", exc_info=True)
 
@@ -133,6 +387,132 @@ def full_steam_sync(self, user_id, force_refresh=False):
 
 
 @celery.task(bind=True, autoretry_for=(requests.RequestException, SQLAlchemyError),
+             retry_kwargs={'max_retries': 3, 'countdown': 60})
+def sync_game_chunk(self, user_id, games_data, parent_task_id):
+    """Sync one chunk of a fanned-out full sync and return its counts."""
+    app = get_flask_app()
+    with app.app_context():
+        try:
+            user = User.query.get(user_id)
+            if not user or not user.steam_id:
+                raise ValueError(f"Invalid user {user_id}")
+
+            context = SyncFetchContext(steam_api.api_service, user.steam_id)
+            engine = SteamFetchEngine.from_config()
+            publisher = ProgressPublisher(self, task_id=parent_task_id)
+            games_synced = 0
+            games_skipped = 0
+            failed_games = []
+
+            for index, (game_data, payload) in enumerate(engine.iter_payloads(context, games_data), 1):
+                game_name = game_data.get("name", f"Game {game_data.get('appid')}")
+                try:
+                    if sync_single_game_sync(user, game_data, context=context):
+                        games_synced += 1
+                        outcome = 'games_synced'
+
+                        game = UserGame.query.filter_by(
+                            user_id=user.id,
+                            steam_app_id=game_data['appid']
+                        ).first()
+                        if game:
+                            check_for_platinum_trophy(game, user)
+                    else:
+                        games_skipped += 1
+                        outcome = 'games_skipped'
+
+                    if index % TaskConfig.COMMIT_BATCH_SIZE == 0:
+                        db.session.commit()
+                        UserSyncLock(user_id).extend(parent_task_id)
+
+                except SteamAPIUnavailable:
+                    raise
+                except Exception as e:
+                    logger.error(f"Error syncing game {game_data.get('name', 'Unknown')}: {e}")
+                    failed_games.append(game_data['appid'])
+                    outcome = 'games_failed'
+
+                _publish_chunk_progress(publisher, parent_task_id, game_data['appid'], game_name, outcome)
+
+            db.session.commit()
+            publisher.flush()
+
+            return {
+                'games_synced': games_synced,
+                'games_skipped': games_skipped,
+                'failed_games': failed_games,
+                'stats': context.get_stats()
+            }
+
+        except SteamAPIUnavailable as e:
+            logger.warning(f"Pausing sync_game_chunk for user {user_id}: {e}")
+            UserSyncLock(user_id).extend(parent_task_id)
+            raise self.retry(exc=e, countdown=e.retry_after, max_retries=TaskConfig.STEAM_OUTAGE_MAX_RETRIES)
+
+        except Exception as e:
+            logger.error(f"Error in sync_game_chunk: {e}", exc_info=True)
+
+            if isinstance(e, (requests.RequestException, SQLAlchemyError)):
+                UserSyncLock(user_id).extend(parent_task_id)
+                raise self.retry(exc=e)
+            else:
+                raise e
+
+
+@celery.task(bind=True)
+def finalize_full_sync(self, chunk_results, user_id, total=0, games_skipped=0,
+                       no_stats_skipped=0, start_time=None):
+    """Chord callback that folds chunk results into the full sync's TaskResult."""
+    app = get_flask_app()
+    with app.app_context():
+        helper = SyncTaskHelper(self, user_id, 'full')
+
+        games_synced = sum(result['games_synced'] for result in chunk_results)
+        games_skipped += sum(result['games_skipped'] for result in chunk_results)
+        failed_games = [app_id for result in chunk_results for app_id in result['failed_games']]
+
+        stats = {}
+        for result in chunk_results:
+            for name, value in result['stats'].items():
+                stats[name] = stats.get(name, 0) + value
+
+        user = User.query.get(user_id)
+        if user:
+            user.last_sync = datetime.utcnow()
+            db.session.commit()
+
+        client = get_steam_redis()
+        if client is not None:
+            try:
+                client.delete(_fan_out_progress_key(self.request.id), _fan_out_counted_key(self.request.id))
+            except redis.RedisError as e:
+                report_redis_failure(e)
+
+        from .stats_tasks import calculate_user_stats
+        calculate_user_stats.delay(user_id)
+
+        UserSyncLock(user_id).release(self.request.id)
+
+        duration = _seconds_since(start_time)
+        processed = games_synced + len(failed_games) + sum(result['games_skipped'] for result in chunk_results)
+
+        return helper.complete_sync(
+            'Full Steam sync completed successfully',
+            games_synced=games_synced,
+            games_skipped=games_skipped,
+            failed_games=failed_games,
+            total=total,
+            stats={
+                'duration_seconds': duration,
+                'avg_games_per_second': processed / duration if duration > 0 else 0,
+                'no_stats_skipped': no_stats_skipped,
+                'chunks': len(chunk_results),
+                **stats
+            }
+        )
+
+
+@celery.task(bind=True, base=UserSyncTask, autoretry_for=(requests.RequestException, SQLAlchemyError),
              retry_kwargs={'max_retries': 3, 'countdown': 30})
 def quick_steam_sync(self, user_id, max_games=20):
     """Quick sync of user's most played games."""
@@ -158,16 +538,17 @@ def quick_steam_sync(self, user_id, max_games=20):
             )[:max_games]
 
             tracker = helper.start_sync(len(games_data), f"Syncing your top {max_games} most played games...")
+            context = SyncFetchContext(steam_api.api_service, user.steam_id)
 
             for game_data in games_data:
                 try:
                     game_name = game_data.get("name", "Unknown Game")
                     helper.update_progress(game_name)
 
-                    if sync_single_game_sync(user, game_data):
+                    if sync_single_game_sync(user, game_data, context=context):
                         tracker.increment_synced()
 
-                        game = Game.query.filter_by(
+                        game = UserGame.query.filter_by(
                             user_id=user.id,
                             steam_app_id=game_data['appid']
                         ).first()
@@ -177,8 +558,8 @@ def quick_steam_sync(self, user_id, max_games=20):
                     else:
                         tracker.increment_skipped()
 
-                    time.sleep(0.3)
-
+                except SteamAPIUnavailable:
+                    raise
                 except Exception as e:
                     logger.error(f"Error in quick sync for game {game_data.get('name', 'Unknown')}: {e}")
                     tracker.increment_failed()
@@ -194,10 +575,15 @@ def quick_steam_sync(self, user_id, max_games=20):
                 total=len(games_data),
                 stats={
                     'duration_seconds': tracker.get_duration_seconds(),
-                    'avg_games_per_second': tracker.get_rate()
+                    'avg_games_per_second': tracker.get_rate(),
+                    'achievements_changed': context.achievements_changed
                 }
             )
 
+        except SteamAPIUnavailable as e:
+            logger.warning(f"Pausing quick_steam_sync for user {user_id}: {e}")
+            raise self.retry(exc=e, countdown=e.retry_after, max_retries=TaskConfig.STEAM_OUTAGE_MAX_RETRIES)
+
         except Exception as e:
             logger.error(f"Error in quick_steam_sync: {e}", exc_info=True)
 
@@ -207,7 +593,7 @@ def quick_steam_sync(self, user_id, max_games=20):
                 raise e
 
 
-@celery.task(bind=True, autoretry_for=(requests.RequestException, SQLAlchemyError),
+@celery.task(bind=True, base=UserSyncTask, autoretry_for=(requests.RequestException, SQLAlchemyError),
              retry_kwargs={'max_retries': 3, 'countdown': 30})
 def sync_specific_games(self, user_id, app_ids):
     """Sync specific games by their Steam App IDs."""
@@ -227,6 +613,7 @@ def sync_specific_games(self, user_id, app_ids):
             games_dict = {game['appid']: game for game in games_data}
 
             tracker = helper.start_sync(len(app_ids), f"Syncing {len(app_ids)} specific games...")
+            context = SyncFetchContext(steam_api.api_service, user.steam_id)
             failed_games = []
 
             for app_id in app_ids:
@@ -240,10 +627,10 @@ def sync_specific_games(self, user_id, app_ids):
 
                     helper.update_progress(game_name)
 
-                    if sync_single_game_sync(user, game_data):
+                    if sync_single_game_sync(user, game_data, context=context):
                         tracker.increment_synced()
                         
-                        game = Game.query.filter_by(
+                        game = UserGame.query.filter_by(
                             user_id=user.id, 
                             steam_app_id=app_id
                         ).first()
@@ -253,8 +640,8 @@ def sync_specific_games(self, user_id, app_ids):
                         tracker.increment_skipped()
                         failed_games.append(app_id)
 
-                    time.sleep(0.3)
-
+                except SteamAPIUnavailable:
+                    raise
                 except Exception as e:
                     logger.error(f"Error syncing specific game {app_id}: {e}")
                     tracker.increment_failed()
@@ -271,10 +658,15 @@ def sync_specific_games(self, user_id, app_ids):
                 total=len(app_ids),
                 stats={
                     'duration_seconds': tracker.get_duration_seconds(),
-                    'successful_app_ids': [app_id for app_id in app_ids if app_id not in failed_games]
+                    'successful_app_ids': [app_id for app_id in app_ids if app_id not in failed_games],
+                    'achievements_changed': context.achievements_changed
                 }
             )
 
+        except SteamAPIUnavailable as e:
+            logger.warning(f"Pausing sync_specific_games for user {user_id}: {e}")
+            raise self.retry(exc=e, countdown=e.retry_after, max_retries=TaskConfig.STEAM_OUTAGE_MAX_RETRIES)
+
         except Exception as e:
             logger.error(f"Error in sync_specific_games: {e}", exc_info=True)
 
@@ -282,3 +674,223 @@ def sync_specific_games(self, user_id, app_ids):
                 raise self.retry(exc=e)
             else:
                 raise e
+
+
+def _select_incremental_games(user_id, games_data, verify_sample):
+    """Split owned games into changed games and a verification sample.
+
+    A game counts as changed when it is not stored yet or when Steam reports a
+    different ``playtime_forever`` or ``rtime_last_played`` than the snapshot
+    taken at its last sync. The sample is the unchanged games with
+    achievements that were synced longest ago, so it rotates through the
+    library as each verified game's ``last_synced`` moves forward.
+    """
+    snapshots = {
+        row.steam_app_id: row
+        for row in db.session.query(
+            UserGame.steam_app_id,
+            UserGame.playtime_forever,
+            UserGame.rtime_last_played,
+            UserGame.last_synced,
+            SteamApp.total_achievements
+        ).join(UserGame.app).filter(UserGame.user_id == user_id)
+    }
+
+    changed = []
+    unchanged = []
+    for game_data in games_data:
+        snapshot = snapshots.get(game_data['appid'])
+        if (snapshot is None or
+                (snapshot.playtime_forever or 0) != game_data.get('playtime_forever', 0) or
+                (snapshot.rtime_last_played is not None and
+                 snapshot.rtime_last_played != game_data.get('rtime_last_played', 0))):
+            changed.append(game_data)
+        elif snapshot.total_achievements:
+            unchanged.append(game_data)
+
+    unchanged.sort(key=lambda game_data: snapshots[game_data['appid']].last_synced or datetime.min)
+    return changed, unchanged[:verify_sample]
+
+
+@celery.task(bind=True, base=UserSyncTask, autoretry_for=(requests.RequestException, SQLAlchemyError),
+             retry_kwargs={'max_retries': 3, 'countdown': 60})
+def incremental_steam_sync(self, user_id, verify_sample=None):
+    """Sync only the games whose owned-games snapshot changed, plus a rotating sample."""
+    app = get_flask_app()
+    with app.app_context():
+        try:
+            user = User.query.get(user_id)
+            if not user or not user.steam_id:
+                raise ValueError(f"Invalid user {user_id}")
+
+            helper = SyncTaskHelper(self, user_id, 'incremental')
+
+            games_data = steam_api.get_user_games(user.steam_id)
+            if not games_data:
+                return helper.complete_sync('No games found in Steam library', total=0)
+
+            if verify_sample is None:
+                verify_sample = app.config.get('STEAM_INCREMENTAL_VERIFY_SAMPLE', 10)
+
+            changed, verifying = _select_incremental_games(user.id, games_data, verify_sample)
+
+            unplayed_app_ids = [g['appid'] for g in changed if g.get('playtime_forever', 0) == 0]
+            no_stats_app_ids = steam_api.api_service.no_stats_cache.filter_members(unplayed_app_ids)
+            changed = [g for g in changed if g['appid'] not in no_stats_app_ids]
+
+            games_to_sync = changed + verifying
+            unchanged_count = len(games_data) - len(games_to_sync)
+            tracker = helper.start_sync(
+                len(games_to_sync),
+                f"Syncing {len(changed)} changed games and verifying {len(verifying)}..."
+            )
+
+            context = SyncFetchContext(steam_api.api_service, user.steam_id)
+            engine = SteamFetchEngine.from_config()
+
+            for game_data, payload in engine.iter_payloads(context, games_to_sync):
+                try:
+                    game_name = game_data.get("name", f"Game {game_data.get('appid')}")
+                    helper.update_progress(game_name, pipeline=engine.stats.to_dict())
+
+                    if sync_single_game_sync(user, game_data, context=context):
+                        tracker.increment_synced()
+
+                        game = UserGame.query.filter_by(
+                            user_id=user.id,
+                            steam_app_id=game_data['appid']
+                        ).first()
+                        if game:
+                            check_for_platinum_trophy(game, user)
+                    else:
+                        tracker.increment_skipped()
+
+                    if tracker.progress.current % TaskConfig.COMMIT_BATCH_SIZE == 0:
+                        db.session.commit()
+
+                except SteamAPIUnavailable:
+                    raise
+                except Exception as e:
+                    logger.error(f"Error in incremental sync for game {game_data.get('name', 'Unknown')}: {e}")
+                    tracker.increment_failed()
+                    continue
+
+            user.last_sync = datetime.utcnow()
+            db.session.commit()
+
+            if context.achievements_changed:
+                from .stats_tasks import calculate_user_stats
+                calculate_user_stats.delay(user_id)
+
+            return helper.complete_sync(
+                f'Incremental sync completed - {len(changed)} changed games',
+                games_synced=tracker.progress.games_synced,
+                games_skipped=tracker.progress.games_skipped + unchanged_count,
+                total=len(games_data),
+                stats={
+                    'duration_seconds': tracker.get_duration_seconds(),
+                    'changed_games': len(changed),
+                    'verified_games': len(verifying),
+                    'unchanged_games': unchanged_count,
+                    'no_stats_skipped': len(no_stats_app_ids),
+                    **context.get_stats()
+                }
+            )
+
+        except SteamAPIUnavailable as e:
+            logger.warning(f"Pausing incremental_steam_sync for user {user_id}: {e}")
+            raise self.retry(exc=e, countdown=e.retry_after, max_retries=TaskConfig.STEAM_OUTAGE_MAX_RETRIES)
+
+        except Exception as e:
+            logger.error(f"Error in incremental_steam_sync: {e}", exc_info=True)
+
+            if isinstance(e, (requests.RequestException, SQLAlchemyError)):
+                raise self.retry(exc=e)
+            else:
+                raise e
+
+
+@celery.task
+def schedule_incremental_syncs():
+    """Queue an incremental sync for every user with a Steam ID."""
+    app = get_flask_app()
+    with app.app_context():
+        user_ids = [row.id for row in User.query.filter(User.steam_id.isnot(None)).with_entities(User.id)]
+
+        started = 0
+        for user_id in user_ids:
+            try:
+                if start_user_sync(user_id, 'incremental')['started']:
+                    started += 1
+            except Exception as e:
+                logger.error(f"Error scheduling incremental sync for user {user_id}: {e}")
+
+        return {'users': len(user_ids), 'started': started}
+
+
+USER_SYNC_TASKS = {
+    'full': full_steam_sync,
+    'quick': quick_steam_sync,
+    'specific': sync_specific_games,
+    'incremental': incremental_steam_sync,
+}
+
+
+def _queue_user_sync(lock, task_id, user_id, sync_type, kwargs):
+    try:
+        USER_SYNC_TASKS[sync_type].apply_async(args=[user_id], kwargs=kwargs, task_id=task_id)
+    except Exception:
+        lock.release(task_id)
+        raise
+    return {'task_id': task_id, 'sync_type': sync_type, 'started': True}
+
+
+def start_user_sync(user_id, sync_type, **kwargs):
+    """Queue a sync for a user unless one is already queued or running.
+
+    A request that finds another sync in flight gets that task's id back with
+    ``started`` False. A full sync is the exception: it takes over from a
+    quick or specific sync that has not started yet and revokes it, returning
+    the revoked id as ``absorbed_task_id``; the revoked task also stands down
+    by itself if a worker already picked it up. Locks left by finished tasks are
+    cleared on the way.
+    """
+    if sync_type not in USER_SYNC_TASKS:
+        raise ValueError(f"Unknown sync type {sync_type}")
+
+    lock = UserSyncLock(user_id)
+    task_id = uuid()
+
+    for _ in range(3):
+        if lock.acquire(task_id, sync_type):
+            return _queue_user_sync(lock, task_id, user_id, sync_type, kwargs)
+
+        held = lock.holder()
+        if held is None:
+            continue
+
+        held_task_id, held_sync_type = held
+        held_state = AsyncResult(held_task_id, app=celery).state
+        if held_state in states.READY_STATES:
+            lock.release(held_task_id)
+            continue
+
+        if sync_type == 'full' and held_sync_type != 'full' and held_state == states.PENDING:
+            if not lock.swap(held, task_id, sync_type):
+                continue
+            # A worker records STARTED before the task checks its lock, so a
+            # task still PENDING now will see the swap and stand down; one that
+            # started meanwhile may be past that check and keeps the lock.
+            if AsyncResult(held_task_id, app=celery).state != states.PENDING:
+                lock.swap((task_id, sync_type), held_task_id, held_sync_type)
+                return {'task_id': held_task_id, 'sync_type': held_sync_type, 'started': False}
+            celery.control.revoke(held_task_id)
+            logger.info(f"Full sync {task_id} absorbed pending {held_sync_type} sync {held_task_id} for user {user_id}")
+            dispatch = _queue_user_sync(lock, task_id, user_id, sync_type, kwargs)
+            dispatch['absorbed_task_id'] = held_task_id
+            return dispatch
+
+        return {'task_id': held_task_id, 'sync_type': held_sync_type, 'started': False}
+
+    logger.warning(f"Could not settle sync lock for user {user_id}; queueing {sync_type} sync without it")
+    return _queue_user_sync(lock, task_id, user_id, sync_type, kwargs)
@@ -15,6 +15,7 @@ def make_celery():
         enable_utc=Config.enable_utc,
         task_annotations=Config.task_annotations,
         task_routes=Config.task_routes,
+        beat_schedule=Config.beat_schedule,
         worker_prefetch_multiplier=Config.worker_prefetch_multiplier,
         task_acks_late=Config.task_acks_late,
         worker_max_tasks_per_child=Config.worker_max_tasks_per_child,
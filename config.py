@@ -18,7 +18,46 @@ class Config:
     
     STEAM_API_KEY = os.environ.get('STEAM_API_KEY') or 'your-steam-api-key'
     STEAM_WEB_API_URL = 'https://api.steampowered.com'
-    
+
+    STEAM_HTTP_POOL_SIZE = int(os.environ.get('STEAM_HTTP_POOL_SIZE', 10))
+    STEAM_HTTP_POOL_BLOCK = True
+    STEAM_HTTP_MAX_RETRIES = int(os.environ.get('STEAM_HTTP_MAX_RETRIES', 2))
+    STEAM_HTTP_BACKOFF_FACTOR = 0.5
+    STEAM_HTTP_TIMEOUTS = {
+        'default': (3.05, 10),
+        'owned_games': (3.05, 20),
+        'player_achievements': (3.05, 10),
+        'global_percentages': (3.05, 10),
+        'schema': (3.05, 15)
+    }
+
+    STEAM_FETCH_MAX_WORKERS = int(os.environ.get('STEAM_FETCH_MAX_WORKERS', 8))
+    STEAM_FETCH_WINDOW_SIZE = 16
+
+    STEAM_RATE_LIMIT_PER_SECOND = float(os.environ.get('STEAM_RATE_LIMIT_PER_SECOND', 10))
+    STEAM_RATE_LIMIT_BURST = int(os.environ.get('STEAM_RATE_LIMIT_BURST', 20))
+
+    STEAM_CIRCUIT_FAILURE_THRESHOLD = 5
+    STEAM_CIRCUIT_FAILURE_WINDOW = 60
+    STEAM_CIRCUIT_BASE_COOLDOWN = 30
+    STEAM_CIRCUIT_MAX_COOLDOWN = 900
+
+    STEAM_SCHEMA_CACHE_TTL = 86400
+    STEAM_SCHEMA_CACHE_STALE_TTL = 7 * 86400
+    STEAM_SCHEMA_CACHE_LRU_SIZE = 512
+
+    STEAM_PERCENTAGES_CACHE_TTL = 6 * 3600
+    STEAM_PERCENTAGES_CACHE_STALE_TTL = 30 * 86400
+    STEAM_PERCENTAGES_CACHE_LRU_SIZE = 512
+    STEAM_PERCENTAGES_REFRESH_LIMIT = 500
+
+    STEAM_NO_STATS_CACHE_TTL = 30 * 86400
+    STEAM_NO_STATS_REVALIDATE_AFTER = 7 * 86400
+    STEAM_NO_STATS_REVALIDATE_PROBABILITY = 0.05
+
+    PAGE_SIZE = int(os.environ.get('PAGE_SIZE', 50))
+    PAGE_SIZE_MAX = 200
+
     REDIS_HOST = os.environ.get('REDIS_HOST', '127.0.0.1')
     REDIS_PORT = os.environ.get('REDIS_PORT', '6380')
 
@@ -46,13 +85,37 @@ class Config:
     task_annotations = {'*': {'rate_limit': '10/m'}}
     task_routes = {}
 
+    beat_schedule = {
+        'refresh-global-percentages': {
+            'task': 'app.tasks.achievement_tasks.refresh_global_percentages',
+            'schedule': timedelta(hours=1)
+        },
+        'incremental-steam-sync': {
+            'task': 'app.tasks.sync_tasks.schedule_incremental_syncs',
+            'schedule': timedelta(hours=6)
+        },
+        'reconcile-user-stats': {
+            'task': 'app.tasks.stats_tasks.reconcile_user_stats_task',
+            'schedule': timedelta(days=1)
+        }
+    }
+
     STEAM_SYNC_RATE_LIMIT = '10/m'
     STEAM_SYNC_TIME_LIMIT = 600
 
+    STEAM_SYNC_FAN_OUT = os.environ.get('STEAM_SYNC_FAN_OUT', 'False').lower() == 'true'
+    STEAM_SYNC_CHUNK_SIZE = int(os.environ.get('STEAM_SYNC_CHUNK_SIZE', 25))
+    STEAM_SYNC_PROGRESS_TTL = 86400
+    STEAM_SYNC_CHECKPOINT_TTL = 86400
+    STEAM_SYNC_LOCK_TTL = 2 * 3600
+    STEAM_INCREMENTAL_VERIFY_SAMPLE = 10
+
     REDIS_NOTIFICATION_URL = os.environ.get('REDIS_NOTIFICATION_URL') or f'redis://{REDIS_HOST}:{REDIS_PORT}/2'
     REDIS_NOTIFICATION_KEY_PREFIX = 'steam_trophy_notifications:'
     REDIS_NOTIFICATION_EXPIRE_TIME = 3600
 
+    STEAM_CACHE_REDIS_URL = os.environ.get('STEAM_CACHE_REDIS_URL') or f'redis://{REDIS_HOST}:{REDIS_PORT}/3'
+
     TROPHY_NOTIFICATIONS_ENABLED = os.environ.get('TROPHY_NOTIFICATIONS_ENABLED', 'True').lower() == 'true' 
     TROPHY_SOUND_ENABLED_DEFAULT = True
     TROPHY_POPUP_ENABLED_DEFAULT = True
@@ -0,0 +1,61 @@
+"""Add trigram / FTS5 search indexes for game and achievement names
+
+Revision ID: b3d5f7a9c2e4
+Revises: a7e2b9d4c1f6
+Create Date: 2026-10-17 20:48:12.903417
+
+"""
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.services.search import ACHIEVEMENT_TEXT_INDEX, GAME_NAME_INDEX, install_sqlite_fts
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3d5f7a9c2e4'
+down_revision = 'a7e2b9d4c1f6'
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger('alembic.runtime.migration')
+
+
+SQLITE_FTS_INDEXES = (GAME_NAME_INDEX, ACHIEVEMENT_TEXT_INDEX)
+
+POSTGRES_TRGM_INDEXES = (
+    ('ix_steam_app_name_trgm', 'steam_app', 'name'),
+    ('ix_achievement_definition_name_trgm', 'achievement_definition', 'name'),
+    ('ix_achievement_definition_description_trgm', 'achievement_definition', 'description'),
+)
+
+
+def upgrade():
+    bind = op.get_bind()
+
+    if bind.dialect.name == 'postgresql':
+        op.execute(sa.text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        for index_name, table, column in POSTGRES_TRGM_INDEXES:
+            op.execute(sa.text(
+                f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} USING gin (lower({column}) gin_trgm_ops)"
+            ))
+
+    elif bind.dialect.name == 'sqlite':
+        for index in SQLITE_FTS_INDEXES:
+            if not install_sqlite_fts(bind, index):
+                logger.warning(f"SQLite FTS5 trigram tokenizer unavailable, {index.name} search will use LIKE")
+
+
+def downgrade():
+    bind = op.get_bind()
+
+    if bind.dialect.name == 'postgresql':
+        for index_name, table, column in POSTGRES_TRGM_INDEXES:
+            op.execute(sa.text(f"DROP INDEX IF EXISTS {index_name}"))
+
+    elif bind.dialect.name == 'sqlite':
+        for index in SQLITE_FTS_INDEXES:
+            for suffix in ('ai', 'ad', 'au'):
+                op.execute(sa.text(f"DROP TRIGGER IF EXISTS {index.name}_{suffix}"))
+            op.execute(sa.text(f"DROP TABLE IF EXISTS {index.name}"))